@@ -1,6 +1,14 @@
+from array import array
+import asyncio
+from collections import defaultdict
 from collections.abc import Callable
+from functools import lru_cache
 import json
+import logging
 from pathlib import Path
+import re
+import sys
+import threading
 
 from aider.coders import Coder
 from aider.io import InputOutput
@@ -12,6 +20,49 @@ from gemini_for_github.shared.logging import BASE_LOGGER
 
 logger = BASE_LOGGER.getChild("aider")
 
+REPO_MAP_MAX_TOKENS = 200_000
+REPO_MAP_MAX_CHARS = 1_048_576
+
+SEARCH_NGRAM_SIZE = 3
+"""Length of the substrings indexed for search_repo_map; shorter search terms fall back to a full scan"""
+
+WRITE_CODE_EDIT_FORMAT = "diff-fenced"
+
+WRITE_CODE_PROMPT_PREFIX = """
+You are a senior developer. You will be given pretty specific instructions to complete a task. The person who prepared these instructions
+may not have fully understood the task, or may have made some mistakes. It is your job to review the instructions and make sure they are
+correct. If other work is required to actually complete the task you will do that.
+"""
+
+WRITE_CODE_PRIMING_MESSAGES = (
+    {"role": "user", "content": WRITE_CODE_PROMPT_PREFIX},
+    {"role": "assistant", "content": "Ok."},
+)
+"""Prior chat exchange that gives write_code the prefix as a stable conversation prefix instead of prepending it to each prompt"""
+
+
+def _json_len(obj: object) -> int:
+    """Returns the length of `obj` serialized as JSON without building the whole string."""
+    return sum(len(chunk) for chunk in json.JSONEncoder().iterencode(obj))
+
+
+def _term_matcher(search_terms: list[str]) -> Callable[[str], bool]:
+    """Returns a predicate telling whether a line contains any of `search_terms`.
+
+    The terms are compiled into a single regex alternation, so each line is scanned once rather than once per term.
+    """
+    if not search_terms:
+        return lambda _line: False
+
+    pattern = re.compile("|".join(map(re.escape, search_terms)))
+    return lambda line: pattern.search(line) is not None
+
+
+@lru_cache(maxsize=8)
+def _get_model(model: str, editor_edit_format: str | None = None) -> Model:
+    """Returns the Aider model for `model`, shared by all clients as it is only configuration."""
+    return Model(model, editor_edit_format=editor_edit_format)
+
 
 class AiderClient:
     """
@@ -21,9 +72,9 @@ class AiderClient:
 
     repo_map: str | None = None
     file_structure: list[str]
-    structured_file_structure: dict[str, list[str]]
-    structured_repo_map: dict[str, list[tuple[int, str]]]
-    inverse_structured_repo_map: dict[str, list[tuple[str, int, str]]]
+    structured_file_structure: dict[str, tuple[str, ...]]
+    structured_repo_map: dict[str, tuple[array, list[str]]]
+    inverse_structured_repo_map: defaultdict[str, list[tuple[str, int, str]]]
 
     def __init__(self, root: Path, model: str):
         """Initializes the AiderClient.
@@ -32,34 +83,67 @@ class AiderClient:
             root: The root directory for Aider's operations.
             model: The specific Gemini model string to be used by Aider (e.g., "gemini/gemini-2.5-flash-preview-04-17").
         """
-        self.root = Path("action_testing/repo")
+        self.root = root
 
-        self.model = Model(
-            f"gemini/{model}",
-            editor_edit_format="diff-fenced",
-        )
+        self.model = _get_model(f"gemini/{model}", editor_edit_format=WRITE_CODE_EDIT_FORMAT)
 
-        io = InputOutput(yes=True)
+        # Shared by every coder of this client so Aider's terminal and history setup only happens once
+        self.io = InputOutput(yes=True, root=str(root))
 
-        repo = GitRepo(io, [], root, models=[self.model])
+        self.repo = GitRepo(self.io, [], str(root), models=[self.model])
 
+        # Cap the map at REPO_MAP_MAX_TOKENS even when no files are in the chat (Aider otherwise multiplies the budget by 8)
         self.coder: Coder = Coder.create(
             main_model=self.model,
-            io=io,
-            repo=repo,
+            io=self.io,
+            repo=self.repo,
+            map_tokens=REPO_MAP_MAX_TOKENS,
+            map_mul_no_files=1,
         )
+        """Only builds the repo maps; requests run on the coders from `_get_coder`, which keep Aider's default map budget"""
+
+        self._coder_lock = asyncio.Lock()
+        """Serializes requests, as the coders and the working tree are shared between calls"""
+
+        self._coders: dict[str, Coder] = {}
+        """Edit format -> coder for that format, sharing `self.io` and `self.repo` with `self.coder`"""
 
-        self.coder.repo_map.max_map_tokens = 200000
+        self._repo_map_cache: tuple[str | None, str] | None = None
+        """(HEAD commit, repo map) of the last get_repo_map call"""
 
         self.file_structure = []
+        self._file_seen: set[str] = set()
+        """Files already listed in file_structure"""
+
         self.structured_file_structure = {}
 
         self.structured_repo_map = {}
-        """File -> Module-level vars, classes, functions"""
+        """File -> (sorted line numbers, line texts) of the module-level vars, classes, functions"""
 
-        self.inverse_structured_repo_map = {}
+        self.inverse_structured_repo_map = defaultdict(list)
         """Module-level vars, classes, functions -> File"""
 
+        self._repo_map_signature: tuple[int, int] | None = None
+        """(id, size) of Aider's tree context cache when the structured repo map was last built"""
+
+        self.repo_map_sizes: dict[str, int] = {}
+        """Serialized size of each part of the structured repo map, only measured when debug logging is enabled"""
+
+        self._search_lines: list[str] = []
+        """Keys of inverse_structured_repo_map, most referenced first, as indexed by _search_index"""
+
+        self._folded_search_lines: list[str] = []
+        """Lower-cased copy of _search_lines that searches are matched against"""
+
+        self._search_results: dict[frozenset[str], list[tuple[str, int, str]]] = {}
+        """Lower-cased search terms -> results, for the current search index"""
+
+        self._search_index: dict[str, set[int]] | None = None
+        """Trigram -> positions in _search_lines of the lines containing it, built on first search"""
+
+        self._repo_map_lock = threading.RLock()
+        """Guards the structured repo map and search index, as read-only tools run concurrently in worker threads"""
+
 
     def get_tools(self) -> dict[str, Callable]:
         """Get the tools available to the Aider client."""
@@ -70,12 +154,14 @@ class AiderClient:
             "get_code_structure": self.get_code_structure,
         }
     
-    def search_repo_map(self, search_terms: list[str]) -> list[tuple[str, int, str]]:
+    def search_repo_map(self, search_terms: list[str], limit: int | None = None) -> list[tuple[str, int, str]]:
         """
-        Search for classes, functions, or comments using search terms.
+        Search for classes, functions, or comments using search terms. Matching is case-insensitive.
 
         Args:
             search_terms: A list of terms to search for.
+            limit: The maximum number of matches to return. Lines that appear in the most places are returned first.
+                   Defaults to returning every match.
 
         Returns:
             A list of tuples containing the file, line number, and line content for each match.
@@ -87,39 +173,206 @@ class AiderClient:
         ```
         """
 
+        with self._repo_map_lock:
+            return self._search_repo_map(search_terms, limit)
+
+    def _search_repo_map(self, search_terms: list[str], limit: int | None) -> list[tuple[str, int, str]]:
+        """Searches the repo map for `search_repo_map`, with the repo map lock held."""
         if self.repo_map is None:
             self.get_structured_repo_map()
 
+        search_index = self._get_search_index()
+        search_lines = self._search_lines
+        folded_search_lines = self._folded_search_lines
+
+        terms = tuple(term.lower() for term in search_terms)
+        terms_key = frozenset(terms)
+
+        if (cached_results := self._search_results.get(terms_key)) is not None:
+            return cached_results[:limit]
+
+        candidates: set[int] = set()
+
+        for term in terms:
+            if len(term) < SEARCH_NGRAM_SIZE:
+                # Too short to be covered by the index, every line is a candidate
+                candidates.update(range(len(search_lines)))
+                break
+
+            postings = [search_index.get(term[i : i + SEARCH_NGRAM_SIZE], set()) for i in range(len(term) - SEARCH_NGRAM_SIZE + 1)]
+            candidates.update(set.intersection(*postings))
+
+        matches_terms = _term_matcher(list(terms))
+
         results = []
 
-        for line, matches in self.inverse_structured_repo_map.items():
-            if any(term in line for term in search_terms):
-                results.extend(matches)
+        # Lines containing every trigram of a term may still not contain the term itself
+        for position in sorted(candidates):
+            if matches_terms(folded_search_lines[position]):
+                results.extend(self.inverse_structured_repo_map[search_lines[position]])
+
+                if limit is not None and len(results) >= limit:
+                    # Partial results are not memoized
+                    return results[:limit]
+
+        self._search_results[terms_key] = results
+
+        return results[:limit]
+
+    def _get_search_index(self) -> dict[str, set[int]]:
+        """Returns the trigram index of the lower-cased lines in inverse_structured_repo_map, building it on first use."""
+        with self._repo_map_lock:
+            if self._search_index is None:
+                inverse_structured_repo_map = self.inverse_structured_repo_map
+                search_lines = sorted(inverse_structured_repo_map, key=lambda line: len(inverse_structured_repo_map[line]), reverse=True)
+                folded_search_lines = [line.lower() for line in search_lines]
+                search_index: dict[str, set[int]] = {}
 
-        return results
+                for position, line in enumerate(folded_search_lines):
+                    for i in range(len(line) - SEARCH_NGRAM_SIZE + 1):
+                        search_index.setdefault(line[i : i + SEARCH_NGRAM_SIZE], set()).add(position)
 
-    def get_code_structure(self) -> dict[str, list[tuple[int, str]]]:
+                # Only publish the index once it is complete
+                self._search_lines = search_lines
+                self._folded_search_lines = folded_search_lines
+                self._search_results = {}
+                self._search_index = search_index
+
+            return self._search_index
+
+    def get_file_lines(self, file: str) -> list[tuple[int, str]]:
+        """Returns the (line number, line) pairs of the repo map for `file`, ordered by line number."""
+        line_nos, texts = self.structured_repo_map.get(file, (array("i"), []))
+        return list(zip(line_nos, texts, strict=True))
+
+    def get_code_structure(self) -> dict[str, tuple[str, ...]]:
         """
         Get the code structure of the repository.
         """
-        if self.repo_map is None:
-            self.get_structured_repo_map()
+        with self._repo_map_lock:
+            if self.repo_map is None:
+                self.get_structured_repo_map()
+
+            return self.structured_file_structure
+
+    def _reset_coder(self, coder: Coder) -> None:
+        """Clears the chat state left behind by a previous request so a coder can be reused."""
+        coder.done_messages.clear()
+        coder.cur_messages.clear()
+        coder.abs_fnames.clear()
+
+    def _get_coder(self, edit_format: str) -> Coder:
+        """Returns the coder using `edit_format`, creating it on first use.
+
+        Callers reset the coder's chat state with `_reset_coder` rather than creating a new one per request.
+        """
+        if (coder := self._coders.get(edit_format)) is None:
+            coder = Coder.create(
+                main_model=self.model,
+                edit_format=edit_format,
+                io=self.io,
+                repo=self.repo,
+            )
+            coder.verbose = True
+            self._coders[edit_format] = coder
+
+        return coder
+
+    def _commit_changes(self, coder: Coder) -> None:
+        """Commits any changes left uncommitted in the working tree, like Aider's `/commit` command."""
+        if coder.repo and coder.repo.is_dirty():
+            coder.repo.commit(coder=coder)
+
+    def _diff_since(self, coder: Coder, commit: str | None) -> str:
+        """Returns the diff of the commits made since `commit` plus any uncommitted changes."""
+        if not coder.repo:
+            return ""
 
-        return self.structured_file_structure
+        diff = ""
+
+        if commit and commit != coder.repo.get_head_commit_sha():
+            diff += coder.repo.diff_commits(False, commit, "HEAD")
+
+        return diff + (coder.repo.get_diffs() or "")
+
+    def get_repo_map(self) -> str | None:
+        """
+        Get Aider's repository map: an outline of the important classes, functions and
+        variables of each file in the repository.
+
+        The map is cached until the HEAD commit of the repository changes. Maps longer than
+        REPO_MAP_MAX_CHARS are cut at the last complete line that fits.
+        """
+        head = self.repo.get_head_commit_sha()
+
+        if self._repo_map_cache is not None and self._repo_map_cache[0] == head:
+            return self._repo_map_cache[1]
+
+        repo_map = self.coder.get_repo_map(force_refresh=True)
+
+        if repo_map is not None:
+            if len(repo_map) > REPO_MAP_MAX_CHARS:
+                logger.warning(f"Repo map is too large ({len(repo_map)} characters), truncating to {REPO_MAP_MAX_CHARS}")
+                cut = repo_map.rfind("\n", 0, REPO_MAP_MAX_CHARS)
+                repo_map = repo_map[: cut if cut > 0 else REPO_MAP_MAX_CHARS]
+
+            self._repo_map_cache = (head, repo_map)
+
+        return repo_map
 
     def get_structured_repo_map(self) -> list[str]:
         """
         Structure the repo map into a more readable format.
         """
-        
+        with self._repo_map_lock:
+            return self._update_structured_repo_map()
+
+    def _update_structured_repo_map(self) -> list[str]:
+        """Brings the structured repo map up to date for `get_structured_repo_map`, with the repo map lock held."""
         if not self.coder.repo_map:
             msg = "Could not get repo map."
             raise AiderError(msg)
 
-        self.repo_map = self.coder.get_repo_map() # type: ignore
         tree_context_cache = self.coder.repo_map.tree_context_cache
 
-        for file, entry in tree_context_cache.items():
+        # Rendering a map is only needed to fill Aider's tree context cache, which every map render keeps up to date
+        if not tree_context_cache:
+            self.repo_map = self.coder.get_repo_map() or ""
+        elif self.repo_map is None:
+            self.repo_map = ""
+
+        signature = (id(tree_context_cache), len(tree_context_cache))
+        if signature == self._repo_map_signature:
+            return self.file_structure
+
+        self._build_structured_repo_map(tree_context_cache)
+
+        # Only mark the map current once it is complete
+        self._repo_map_signature = signature
+        self._search_index = None
+
+        return self.file_structure
+
+    def _build_structured_repo_map(self, tree_context_cache: dict) -> None:
+        """Builds the structured repo map from Aider's tree context cache."""
+        self.file_structure = []
+        self._file_seen = set()
+        self.structured_file_structure = {}
+        self.structured_repo_map = {}
+        self.inverse_structured_repo_map = defaultdict(list)
+
+        # Identical lines and chunks recur across files, keep a single copy of each
+        string_pool: dict[str, str] = {}
+        pooled = string_pool.setdefault
+
+        # Bound once here as they are used for every line of every file
+        inverse_structured_repo_map = self.inverse_structured_repo_map
+        structured_repo_map = self.structured_repo_map
+        join_lines = "\n".join
+
+        file_names_by_dir: dict[str, set[str]] = {}
+
+        for cached_file, entry in tree_context_cache.items():
             context = entry["context"]
             if not context:
                 continue
@@ -132,54 +385,64 @@ class AiderClient:
             if not shown_lines:
                 continue
 
-            lines = lines_of_interest
-
-            interesting_detailed_lines: list[tuple[int, str]] = [
-                (line_no, context.lines[line_no])
-                for line_no in {*lines, *shown_lines}
-            ]
-
-            self.structured_repo_map[file] = interesting_detailed_lines
+            lines = set(lines_of_interest)
+            context_lines = context.lines
+            file = sys.intern(cached_file)
 
             # Store more full chunks when we get asked for a file name
-            interesting_lines: list[tuple[int, str]] = [
-                (line_no, context.lines[line_no])
-                for line_no in lines
-            ]
-            # Store smaller chunks for our inverse lookup
-            for line_no, line in interesting_lines:
+            interesting_detailed_lines: list[tuple[int, str]] = []
+            add_detailed_line = interesting_detailed_lines.append
 
-                if line not in self.inverse_structured_repo_map:
-                    self.inverse_structured_repo_map[line] = []
+            # Store smaller chunks for our inverse lookup
+            for line_no in lines:
+                line = context_lines[line_no]
+                line = pooled(line, line)
+                add_detailed_line((line_no, line))
 
                 # Get the five lines before and after the line of interest
-                text_chunk = "\n".join(context.lines[line_no-5:line_no+5])
-
-                self.inverse_structured_repo_map[line].append((file, line_no, text_chunk))
+                chunk_start = max(line_no - 5, 0)
+                chunk_end = line_no + 5
+                text_chunk = join_lines(context_lines[chunk_start:chunk_end])
+                text_chunk = pooled(text_chunk, text_chunk)
+
+                inverse_structured_repo_map[line].append((file, line_no, text_chunk))
+
+            interesting_detailed_lines.extend(
+                (line_no, pooled(context_lines[line_no], context_lines[line_no]))
+                for line_no in shown_lines
+                if line_no not in lines
+            )
+
+            interesting_detailed_lines.sort()
+            structured_repo_map[file] = (
+                array("i", [line_no for line_no, _ in interesting_detailed_lines]),
+                [line for _, line in interesting_detailed_lines],
+            )
+
+            if file in self._file_seen:
+                continue
 
             # Generate a flat list of files for our file structure
+            self._file_seen.add(file)
             self.file_structure.append(file)
 
-            file_path_parts = file.split("/")
-            file_name = file_path_parts[-1]
-            file_dir = "/".join(file_path_parts[:-1])
+            file_dir, _, file_name = file.rpartition("/")
 
-            if file_dir not in self.structured_file_structure:
-                self.structured_file_structure[file_dir] = []
+            file_names_by_dir.setdefault(file_dir, set()).add(file_name)
 
-            self.structured_file_structure[file_dir].append(file_name)
-
-
-        repo_map_size = len(json.dumps(self.repo_map))
-        file_structure_size = len(json.dumps(self.file_structure))
-        structured_file_structure_size = len(json.dumps(self.structured_file_structure))
-        structured_repo_map_size = len(json.dumps(self.structured_repo_map))
-        inverse_structured_repo_map_size = len(json.dumps(self.inverse_structured_repo_map))
-        return self.file_structure
+        self.structured_file_structure = {file_dir: tuple(sorted(file_names)) for file_dir, file_names in file_names_by_dir.items()}
 
+        if logger.isEnabledFor(logging.DEBUG):
+            self.repo_map_sizes = {
+                "repo_map": _json_len(self.repo_map),
+                "file_structure": _json_len(self.file_structure),
+                "structured_file_structure": _json_len(self.structured_file_structure),
+                "structured_repo_map": _json_len({file: self.get_file_lines(file) for file in self.structured_repo_map}),
+                "inverse_structured_repo_map": _json_len(self.inverse_structured_repo_map),
+            }
+            logger.debug(f"Structured repo map sizes: {self.repo_map_sizes}")
 
-
-    def offer_code_diff(self, prompt: str) -> str:
+    async def offer_code_diff(self, prompt: str) -> str:
         """
         Executes Aider with a prompt and returns the proposed code changes as a diff.
 
@@ -234,25 +497,21 @@ class AiderClient:
             AiderNoneResultError: If Aider returns None unexpectedly.
         """
 
-        io = InputOutput(yes=True)
-
-        repo = GitRepo(io, [], str(self.root), models=[self.model])
-        self.coder: Coder = Coder.create(
-            main_model=self.model,
-            io=io,
-            repo=repo,
-        )
-        #self.coder.verbose = True
-
         logger.info(f"Invoking Aider in {self.root}, cwd: {Path.cwd()} with prompt: {prompt[:1000]}...")
 
-        try:
-            self.coder.run(with_message=prompt)
-            result = self.coder.run(with_message="/diff")
-        except Exception as e:
-            msg = "Error invoking Aider with prompt: " + prompt
-            logger.exception(msg)
-            raise AiderError(msg) from e
+        async with self._coder_lock:
+            # The model's own edit format, as a coder created without one would use
+            coder = self._get_coder(self.model.edit_format)
+            self._reset_coder(coder)
+
+            try:
+                commit_before = self.repo.get_head_commit_sha()
+                response = await asyncio.to_thread(coder.run, with_message=prompt)
+                result = await asyncio.to_thread(self._diff_since, coder, commit_before) or response
+            except Exception as e:
+                msg = "Error invoking Aider with prompt: " + prompt
+                logger.exception(msg)
+                raise AiderError(msg) from e
 
         if result is None:
             msg = "Aider returned None"
@@ -260,7 +519,7 @@ class AiderClient:
 
         return result
 
-    def write_code(self, prompt: str, commit_when_done: bool = True) -> str:
+    async def write_code(self, prompt: str, commit_when_done: bool = True) -> str:
         """
         Executes Aider with a prompt, allowing it to apply code changes directly.
 
@@ -268,13 +527,13 @@ class AiderClient:
         provided prompt. Aider will attempt to understand the request, generate the
         necessary code changes, and apply them to the files in the repository.
 
-        A prefix is added to the prompt instructing Aider to act as a senior developer
+        The chat history is primed with instructions for Aider to act as a senior developer
         and critically evaluate the given instructions before proceeding.
 
         Args:
             prompt: The detailed natural language instructions for the desired code changes.
-            commit_when_done: If True, Aider will attempt to automatically commit the
-                              applied changes using `/commit`. Defaults to True.
+            commit_when_done: If True, any applied changes that Aider left uncommitted are
+                              committed when it is done. Defaults to True.
 
         Returns:
             str: A string containing the results or logs from the Aider execution,
@@ -286,35 +545,21 @@ class AiderClient:
             AiderNoneResultError: If Aider returns None unexpectedly.
         """
 
-        io = InputOutput(yes=True)
-
-        repo = GitRepo(io, [], str(self.root), models=[self.model])
-        self.coder: Coder = Coder.create(
-            main_model=self.model,
-            edit_format="diff-fenced",
-            io=io,
-            repo=repo,
-        )
-        self.coder.verbose = True
-
-        prompt_prefix = """
-You are a senior developer. You will be given pretty specific instructions to complete a task. The person who prepared these instructions
-may not have fully understood the task, or may have made some mistakes. It is your job to review the instructions and make sure they are
-correct. If other work is required to actually complete the task you will do that.
-"""
-
-        logger.info(f"Invoking Aider in {self.root}, cwd: {Path.cwd()} with prompt prefix (not shown) and prompt: {prompt[:100]}...")
-
-        final_prompt = prompt_prefix + prompt
-
-        try:
-            result = self.coder.run(with_message=final_prompt)
-            if commit_when_done:
-                self.coder.run(with_message="/commit")
-        except Exception as e:
-            msg = "Error invoking Aider with prompt: " + prompt
-            logger.exception(msg)
-            raise AiderError(msg) from e
+        logger.info(f"Invoking Aider in {self.root}, cwd: {Path.cwd()} with priming messages (not shown) and prompt: {prompt[:100]}...")
+
+        async with self._coder_lock:
+            coder = self._get_coder(WRITE_CODE_EDIT_FORMAT)
+            self._reset_coder(coder)
+            coder.done_messages.extend(WRITE_CODE_PRIMING_MESSAGES)
+
+            try:
+                result = await asyncio.to_thread(coder.run, with_message=prompt)
+                if commit_when_done:
+                    await asyncio.to_thread(self._commit_changes, coder)
+            except Exception as e:
+                msg = "Error invoking Aider with prompt: " + prompt
+                logger.exception(msg)
+                raise AiderError(msg) from e
 
         if result is None:
             msg = "Aider returned None"
@@ -5,11 +5,19 @@ This server provides tools for reading, creating, appending, erasing, moving,
 and deleting files, with centralized exception handling.
 """
 
+import asyncio
+import errno
+import mmap
 import os
+import re
 import shutil
-from collections.abc import Callable
-from contextlib import asynccontextmanager
-from fnmatch import fnmatch
+import threading
+from collections import OrderedDict
+from collections.abc import AsyncIterator, Callable
+from contextlib import contextmanager
+from fnmatch import translate
+from functools import lru_cache
+from itertools import islice
 from pathlib import Path
 
 from fastmcp.contrib.mcp_mixin import MCPMixin
@@ -19,24 +27,31 @@ from gemini_for_github.shared.logging import BASE_LOGGER
 
 logger = BASE_LOGGER.getChild("filesystem")
 
+READ_ALL_CONCURRENCY = 64
+"""Maximum number of files read at once by FolderOperations.read_all"""
+
+MMAP_THRESHOLD_BYTES = 64 * 1024
+"""Files at least this large are decoded straight from a memory map rather than read into a buffer first"""
+
+TAIL_BLOCK_BYTES = 64 * 1024
+"""Size of the blocks read backwards from the end of a file to find its last lines"""
+
+CONTENT_CACHE_MAX_CHARS = 32 * 1024 * 1024
+"""Maximum total size of the file contents FileOperations keeps for repeated reads of unchanged files"""
+
+CONTENT_CACHE_MAX_FILE_CHARS = 1024 * 1024
+"""Files larger than this are read again on every FileOperations.read rather than cached"""
+
 DEFAULT_SKIP_LIST = [
     "**/.?*/**",
-    ".?*/**",  # exclude hidden folders
+    ".?*/**",  # exclude hidden folders, like .git, .svn, .venv, .mypy_cache and .pytest_cache
     "**/.?*",  # exclude hidden files
-    "**/.git/**",
-    ".git/*",
-    "**/.svn/**",
-    ".svn/*",
-    "**/.mypy_cache/**",
-    ".mypy_cache/*",
-    "**/.pytest_cache/**",
-    "*.pytest_cache/*",
-    "**/__pycache__/**",
     "*__pycache__/*",
-    "**/.venv/**",
-    ".venv/*",
 ]
 
+DEFAULT_SKIP_DIR_NAMES = frozenset({".git", ".svn", ".venv", ".mypy_cache", ".pytest_cache", "__pycache__"})
+"""Names of folders that DEFAULT_SKIP_LIST excludes wherever they are, recognised without matching any pattern"""
+
 DEFAULT_SKIP_READ = [
     "*.pyc",
     "*.pyo",
@@ -110,15 +125,17 @@ class MCPFolderNotFoundError(MCPFolderOperationError):
         super().__init__("Folder not found", folder_path)
 
 
-@asynccontextmanager
-async def handle_file_errors(path: str):
+@contextmanager
+def handle_file_errors(path: str):
     """
-    Async context manager to handle file operation exceptions.
+    Context manager to handle file operation exceptions.
+
+    It is synchronous, so entering it costs no coroutine, yet it still wraps the awaits inside an async operation.
     """
     try:
-        logger.info(f"Handling file operation for {path}")
+        logger.debug("Handling file operation for %s", path)
         yield
-        logger.info(f"File operation completed successfully for {path}")
+        logger.debug("File operation completed successfully for %s", path)
     except FileNotFoundError as e:
         msg = f"File not found: {e}"
         logger.exception(msg)
@@ -133,15 +150,17 @@ async def handle_file_errors(path: str):
         raise MCPFileOperationError(msg, path) from e
 
 
-@asynccontextmanager
-async def handle_folder_errors(path: str):
+@contextmanager
+def handle_folder_errors(path: str):
     """
-    Async context manager to handle folder operation exceptions.
+    Context manager to handle folder operation exceptions.
+
+    It is synchronous, so entering it costs no coroutine, yet it still wraps the awaits inside an async operation.
     """
     try:
-        logger.info(f"Handling folder operation for {path}")
+        logger.debug("Handling folder operation for %s", path)
         yield
-        logger.info(f"Folder operation completed successfully for {path}")
+        logger.debug("Folder operation completed successfully for %s", path)
     except FileNotFoundError as e:
         msg = f"File not found: {e}"
         logger.exception(msg)
@@ -156,6 +175,139 @@ async def handle_folder_errors(path: str):
         raise MCPFolderOperationError(msg, path) from e
 
 
+@lru_cache(maxsize=128)
+def _compile_globs(patterns: tuple[str, ...]) -> re.Pattern[str] | None:
+    """Compiles glob patterns into a single regex that matches a path matching any of them, or None if there are no patterns."""
+    if not patterns:
+        return None
+
+    return re.compile("|".join(translate(pattern) for pattern in patterns))
+
+
+def _split_suffix_globs(patterns: list[str]) -> tuple[tuple[str, ...], tuple[str, ...]]:
+    """
+    Splits glob patterns into the literal suffixes of those that are just "*" followed by a literal, like "*.pyc",
+    and the remaining patterns. Since "*" also matches "/", such a pattern matches exactly the paths ending in its suffix.
+    """
+    suffixes = []
+    remaining = []
+
+    for pattern in patterns:
+        if pattern.startswith("*") and len(pattern) > 1 and not any(char in pattern[1:] for char in "*?["):
+            suffixes.append(pattern[1:])
+        else:
+            remaining.append(pattern)
+
+    return tuple(suffixes), tuple(remaining)
+
+
+_DEFAULT_SKIP_LIST_RE = _compile_globs(tuple(DEFAULT_SKIP_LIST))
+"""DEFAULT_SKIP_LIST compiled once for every FolderOperations"""
+
+# A pattern ending in "*" that matches "some/folder/" also matches everything below it, so matching folders need not be walked
+_DEFAULT_PRUNED_FOLDERS_RE = _compile_globs(tuple(pattern for pattern in DEFAULT_SKIP_LIST if pattern.endswith("*")))
+"""The DEFAULT_SKIP_LIST patterns that rule out whole folders, compiled once for every FolderOperations"""
+
+# Most read exclusions are file extensions, which a suffix check rules out before running the regex
+_DEFAULT_SKIP_READ_SUFFIXES, _DEFAULT_SKIP_READ_GLOBS = _split_suffix_globs(DEFAULT_SKIP_READ)
+_DEFAULT_SKIP_READ_RE = _compile_globs(_DEFAULT_SKIP_READ_GLOBS)
+"""The DEFAULT_SKIP_READ patterns not covered by _DEFAULT_SKIP_READ_SUFFIXES, compiled once for every FolderOperations"""
+
+
+def _read_text(file_path: str) -> str:
+    """Reads a whole file like `open(file_path, encoding="utf-8").read()`, including its newline translation. Blocking."""
+    fd = os.open(file_path, os.O_RDONLY)
+    try:
+        size = os.fstat(fd).st_size
+        if size < MMAP_THRESHOLD_BYTES:
+            # Asking for one byte more than the file holds reads it whole in a single call, with no file object
+            data = os.read(fd, size + 1)
+            if len(data) > size:
+                # The file grew since fstat, so read on to its end
+                data += b"".join(iter(lambda: os.read(fd, MMAP_THRESHOLD_BYTES), b""))
+            content = data.decode("utf-8")
+        else:
+            with mmap.mmap(fd, 0, access=mmap.ACCESS_READ) as mapped:
+                content = str(mapped, "utf-8")
+    finally:
+        os.close(fd)
+
+    if "\r" in content:
+        content = content.replace("\r\n", "\n").replace("\r", "\n")
+
+    return content
+
+
+def _read_tail(file_path: str, line_count: int) -> str:
+    """Reads the last `line_count` lines of a file as UTF-8 with universal newlines, without reading the rest of it. Blocking."""
+    fd = os.open(file_path, os.O_RDONLY)
+    try:
+        offset = os.fstat(fd).st_size
+        blocks: list[bytes] = []
+        newlines = 0
+
+        # One more newline than lines wanted guarantees the first wanted line is complete
+        while offset > 0 and newlines <= line_count:
+            size = min(TAIL_BLOCK_BYTES, offset)
+            offset -= size
+            block = os.pread(fd, size, offset)
+            blocks.append(block)
+            newlines += block.count(b"\n")
+    finally:
+        os.close(fd)
+
+    data = b"".join(reversed(blocks))
+
+    if offset > 0:
+        # Drop the partial line the first block started in
+        data = data[data.index(b"\n") + 1 :]
+
+    content = data.decode("utf-8")
+    if "\r" in content:
+        content = content.replace("\r\n", "\n").replace("\r", "\n")
+
+    if not content:
+        return content
+
+    lines = content.split("\n")
+    ends_with_newline = lines[-1] == ""
+    if ends_with_newline:
+        lines.pop()
+
+    return "\n".join(lines[-line_count:]) + ("\n" if ends_with_newline else "")
+
+
+def _read_file(file_path: str, head: int, tail: int) -> str:
+    """Reads a file for FolderOperations.read_all, honouring its `head` and `tail` options. Blocking."""
+    if head > 0:
+        with open(file_path, encoding="utf-8", errors="strict") as f:
+            # Stop reading once enough lines are found rather than loading the whole file
+            return "".join(islice(f, head))
+
+    if tail > 0:
+        return _read_tail(file_path, tail)
+
+    return _read_text(file_path)
+
+
+def _write_text(file_path: str, content: str, mode: str) -> None:
+    """Writes `content` to a file opened with `mode` as UTF-8. Blocking."""
+    with open(file_path, mode, encoding="utf-8") as f:
+        f.write(content)
+
+
+def _move(source_path: str, destination_path: str) -> None:
+    """Renames a file or folder, copying it across when the destination is on another filesystem. Blocking."""
+    try:
+        os.rename(source_path, destination_path)
+    except OSError as e:
+        if e.errno != errno.EXDEV:
+            raise
+
+        # shutil.move copies with os.sendfile where available, so the data does not pass through userspace
+        shutil.move(source_path, destination_path)
+
+
 class FileOperations:
     """
     This class provides tools to manipulate files.
@@ -172,6 +324,11 @@ class FileOperations:
         """
         self.root_dir = root_dir
 
+        self._content_cache: OrderedDict[str, tuple[tuple[int, int], str]] = OrderedDict()
+        """Recently read file contents by path, with the (mtime, size) they were read at, least recently used first"""
+        self._content_cache_size = 0
+        self._content_cache_lock = threading.Lock()
+
     def get_tools(self) -> dict[str, Callable]:
         """Get the tools available to the file operations."""
         return {
@@ -200,12 +357,48 @@ class FileOperations:
             MCPFileNotFoundError: If the file at `file_path` does not exist.
             MCPFileOperationError: For permission errors or other issues reading the file.
         """
-        async with handle_file_errors(file_path):
-            with open(file_path, encoding="utf-8") as f:
-                content = f.read()
-        logger.info(f"File read successfully from {file_path}: {content[:100]}")
+        with handle_file_errors(file_path):
+            content = await asyncio.to_thread(self._read_cached, file_path)
+        logger.info("File read successfully from %s: %d characters", file_path, len(content))
         return content
 
+    def _read_cached(self, file_path: str) -> str:
+        """
+        Reads a whole file like `_read_text`, reusing the content of an earlier read while the file's modification
+        time and size are unchanged. Blocking.
+        """
+        stat = Path(file_path).stat()
+        signature = (stat.st_mtime_ns, stat.st_size)
+
+        with self._content_cache_lock:
+            cached = self._content_cache.get(file_path)
+            if cached is not None and cached[0] == signature:
+                self._content_cache.move_to_end(file_path)
+                return cached[1]
+
+        content = _read_text(file_path)
+
+        if len(content) <= CONTENT_CACHE_MAX_FILE_CHARS:
+            with self._content_cache_lock:
+                if (previous := self._content_cache.pop(file_path, None)) is not None:
+                    self._content_cache_size -= len(previous[1])
+
+                self._content_cache[file_path] = (signature, content)
+                self._content_cache_size += len(content)
+
+                while self._content_cache_size > CONTENT_CACHE_MAX_CHARS:
+                    _, (_, evicted) = self._content_cache.popitem(last=False)
+                    self._content_cache_size -= len(evicted)
+
+        return content
+
+    def _forget_content(self, *file_paths: str) -> None:
+        """Drops the cached content of files this class has just changed, however quickly their modification time moved."""
+        with self._content_cache_lock:
+            for file_path in file_paths:
+                if (cached := self._content_cache.pop(file_path, None)) is not None:
+                    self._content_cache_size -= len(cached[1])
+
     async def create(self, file_path: str, content: str) -> bool:
         """
         Creates a file with the specified content.
@@ -217,9 +410,9 @@ class FileOperations:
         Returns:
             bool: True if the file was created successfully, False otherwise.
         """
-        async with handle_file_errors(file_path):
-            with open(file_path, "w", encoding="utf-8") as f:
-                f.write(content)
+        with handle_file_errors(file_path):
+            await asyncio.to_thread(_write_text, file_path, content, "w")
+            self._forget_content(file_path)
             logger.info(f"File created successfully at {file_path}")
             return True
 
@@ -234,9 +427,9 @@ class FileOperations:
         Returns:
             bool: True if the content was appended successfully, False otherwise.
         """
-        async with handle_file_errors(file_path):
-            with open(file_path, "a", encoding="utf-8") as f:
-                f.write(content)
+        with handle_file_errors(file_path):
+            await asyncio.to_thread(_write_text, file_path, content, "a")
+            self._forget_content(file_path)
             logger.info(f"Content appended successfully to {file_path}")
             return True
 
@@ -250,9 +443,9 @@ class FileOperations:
         Returns:
             bool: True if the file was erased successfully, False otherwise.
         """
-        async with handle_file_errors(file_path):
-            with open(file_path, "w", encoding="utf-8") as f:
-                f.write("")
+        with handle_file_errors(file_path):
+            await asyncio.to_thread(_write_text, file_path, "", "w")
+            self._forget_content(file_path)
             logger.info(f"File content erased successfully at {file_path}")
             return True
 
@@ -267,8 +460,9 @@ class FileOperations:
         Returns:
             bool: True if the file was moved successfully, False otherwise.
         """
-        async with handle_file_errors(source_path):
-            os.rename(source_path, destination_path)
+        with handle_file_errors(source_path):
+            await asyncio.to_thread(_move, source_path, destination_path)
+            self._forget_content(source_path, destination_path)
             logger.info(f"File moved from {source_path} to {destination_path}")
             return True
 
@@ -282,8 +476,9 @@ class FileOperations:
         Returns:
             bool: True if the file was deleted successfully, False otherwise.
         """
-        async with handle_file_errors(file_path):
-            os.remove(file_path)
+        with handle_file_errors(file_path):
+            await asyncio.to_thread(os.remove, file_path)
+            self._forget_content(file_path)
             logger.info(f"File deleted successfully at {file_path}")
             return True
 
@@ -356,6 +551,10 @@ class FolderOperations(MCPMixin):
         """
         self.read_file_exclusions = DEFAULT_SKIP_READ
         self.list_folder_exclusions = DEFAULT_SKIP_LIST
+        self._read_file_excluded_suffixes = _DEFAULT_SKIP_READ_SUFFIXES
+        self._read_file_exclusions_re = _DEFAULT_SKIP_READ_RE
+        self._list_folder_exclusions_re = _DEFAULT_SKIP_LIST_RE
+        self._pruned_folders_re = _DEFAULT_PRUNED_FOLDERS_RE
         self.root_dir = root_dir
         super().__init__()
 
@@ -378,29 +577,46 @@ class FolderOperations(MCPMixin):
         Returns:
             bool: True if the folder was created successfully, False otherwise.
         """
-        async with handle_folder_errors(folder_path):
+        with handle_folder_errors(folder_path):
             os.makedirs(folder_path, exist_ok=True)
             logger.info(f"Folder created successfully at {folder_path}")
             return True
 
-    def _matches_globs(self, path: str, include: list[str], exclude: list[str]) -> bool:
+    def _matches_globs(self, path: str, include: re.Pattern[str] | None, exclude: re.Pattern[str] | None) -> bool:
         """
         Checks if the given path matches the include and exclude glob patterns.
 
         Args:
             path: The path to check.
-            include: A list of glob patterns to include specific files.
-            exclude: A list of glob patterns to exclude specific files.
+            include: The compiled glob patterns (see `_compile_globs`) to include specific files. None includes everything.
+            exclude: The compiled glob patterns to exclude specific files. None excludes nothing.
 
         Returns:
             bool: True if the path matches the include patterns and does not match the exclude patterns.
         """
 
-        included = any(fnmatch(path, pat) for pat in include) if include else True
-        excluded = any(fnmatch(path, pat) for pat in exclude) if exclude else False
+        included = include.match(path) is not None if include else True
+        excluded = exclude.match(path) is not None if exclude else False
 
         return included and not excluded
 
+    def _is_excluded(self, path: str, exclude: re.Pattern[str] | None, excluded_suffixes: tuple[str, ...] = ()) -> bool:
+        """
+        Checks if the given path matches the compiled exclusion glob patterns (see `_compile_globs`).
+
+        Args:
+            path: The path to check.
+            exclude: The compiled glob patterns to exclude specific files. None excludes nothing.
+            excluded_suffixes: Literal suffixes split off the exclusion patterns (see `_split_suffix_globs`), checked first.
+
+        Returns:
+            bool: True if the path ends with one of the excluded suffixes or matches the exclude patterns.
+        """
+        if excluded_suffixes and path.endswith(excluded_suffixes):
+            return True
+
+        return exclude is not None and exclude.match(path) is not None
+
     async def contents(
         self, folder_path: str, include: list[str], exclude: list[str], recurse: bool, bypass_default_exclusions: bool = False
     ) -> list:
@@ -429,33 +645,174 @@ class FolderOperations(MCPMixin):
             MCPFolderNotFoundError: If `folder_path` does not exist or is not a directory.
             MCPFolderOperationError: For permission errors or other issues listing the directory.
         """
-        async with handle_folder_errors(folder_path):
-            contents = []
+        with handle_folder_errors(folder_path):
+            listing, _ = await asyncio.to_thread(
+                self._list_contents, folder_path, include, exclude, recurse=recurse, bypass_default_exclusions=bypass_default_exclusions
+            )
+            contents = [rel_file for rel_file, _ in listing]
 
-            if recurse:
-                for dir_, _, files in os.walk(folder_path):
-                    for file_name in files:
-                        rel_dir = os.path.relpath(dir_, folder_path)
-                        rel_file = os.path.join(rel_dir, file_name)
+            logger.info(f"Contents of {folder_path} listed successfully {len(contents)} files")
+            return contents
 
-                        if not bypass_default_exclusions:
-                            # Check if the file matches any default exclusion patterns
-                            if not self._matches_globs(rel_file, include=["*"], exclude=self.list_folder_exclusions):
-                                logger.debug(f"Skipping file due to folder exclusions: {rel_file}")
-                                continue
+    def _list_contents(  # noqa: PLR0913
+        self,
+        folder_path: str,
+        include: list[str],
+        exclude: list[str],
+        *,
+        recurse: bool,
+        bypass_default_exclusions: bool,
+        files_only: bool = False,
+    ) -> tuple[list[tuple[str, str]], int]:
+        """
+        Lists the contents of a folder like `contents`, in a single pass over the folder.
 
-                        if self._matches_globs(rel_file, include, exclude):
-                            contents.append(rel_file)
-                            logger.debug(f"Included file: {rel_file}")
-            else:
-                contents = os.listdir(folder_path)
-                for file in contents:
-                    if not self._matches_globs(file, include=["*"], exclude=self.list_folder_exclusions):
-                        logger.debug(f"Skipping file due to folder exclusions: {file}")
-                        contents.remove(file)
+        Args:
+            files_only: If True, only regular files (or links to them) are listed.
 
-            logger.info(f"Contents of {folder_path} listed successfully {len(contents)} files")
-            return contents
+        Returns:
+            tuple[list[tuple[str, str]], int]: The (relative path, path) of every item whose relative path matches `include`
+                                               and `exclude`, and the number of items that would have been listed without
+                                               `include` and `exclude`. The path is the item's path under `folder_path`.
+        """
+        include_re = _compile_globs(tuple(include))
+        exclude_re = _compile_globs(tuple(exclude))
+
+        contents = []
+        unfiltered_count = 0
+
+        if recurse:
+            prune = None if bypass_default_exclusions else self._pruned_folders_re
+
+            # The default exclusions rule out every hidden file and folder, which the walk can skip by name alone
+            for rel_file, file_path, is_file in self._walk(folder_path, prune, skip_hidden=not bypass_default_exclusions):
+                if files_only and not is_file:
+                    continue
+
+                if not bypass_default_exclusions:
+                    # Check if the file matches any default exclusion patterns
+                    if self._is_excluded(rel_file, self._list_folder_exclusions_re):
+                        logger.debug("Skipping file due to folder exclusions: %s", rel_file)
+                        continue
+
+                unfiltered_count += 1
+
+                if self._matches_globs(rel_file, include_re, exclude_re):
+                    contents.append((rel_file, file_path))
+                    logger.debug("Included file: %s", rel_file)
+        else:
+            # One pass over the entries, filtered like the recursive walk filters the top level of the folder
+            with os.scandir(folder_path) as entries:
+                for entry in entries:
+                    if files_only and not entry.is_file():
+                        continue
+
+                    if not bypass_default_exclusions:
+                        # The walk sees top-level files as "./name" and checks folders as "name/"
+                        walked_path = entry.name + "/" if entry.is_dir() else "./" + entry.name
+                        if self._is_excluded(walked_path, self._list_folder_exclusions_re):
+                            logger.debug("Skipping file due to folder exclusions: %s", entry.name)
+                            continue
+
+                    unfiltered_count += 1
+
+                    if self._matches_globs(entry.name, include_re, exclude_re):
+                        contents.append((entry.name, entry.path))
+
+        return contents, unfiltered_count
+
+    def _walk(
+        self, folder_path: str, prune: re.Pattern[str] | None = None, skip_hidden: bool = False
+    ) -> list[tuple[str, str, bool]]:
+        """
+        Walks a folder top-down like `os.walk`, returning the relative path and path of every non-folder entry and whether it is a file.
+
+        Files directly in the walked folder are prefixed with "./", as `os.walk` based listings have always reported
+        them. Unreadable subfolders are skipped, but an unreadable top-level folder raises.
+
+        Args:
+            folder_path: The folder to walk.
+            prune: Subfolders whose relative path, including the trailing slash, matches this pattern are not walked.
+            skip_hidden: If True, entries whose name starts with "." are left out, and hidden folders are not walked.
+        """
+        files, subfolders = self._scan_folder(folder_path, "./", prune, skip_hidden)
+
+        for subfolder_path, subfolder_prefix in subfolders:
+            files.extend(self._walk_subtree(subfolder_path, subfolder_prefix, prune, skip_hidden))
+
+        return files
+
+    def _walk_subtree(
+        self, dir_path: str, rel_prefix: str, prune: re.Pattern[str] | None, skip_hidden: bool
+    ) -> list[tuple[str, str, bool]]:
+        """
+        Walks a subfolder for `_walk` in the current thread, skipping unreadable folders.
+
+        The walk keeps its own stack rather than recursing, so deep trees cost no call frames; pushing each folder's
+        subfolders in reverse keeps the top-down order of a recursive walk.
+        """
+        files: list[tuple[str, str, bool]] = []
+        stack = [(dir_path, rel_prefix)]
+
+        while stack:
+            folder, folder_prefix = stack.pop()
+            try:
+                folder_files, subfolders = self._scan_folder(folder, folder_prefix, prune, skip_hidden)
+            except OSError as e:
+                logger.debug("Skipping unreadable folder %s: %s", folder, e)
+                continue
+
+            files.extend(folder_files)
+            stack.extend(reversed(subfolders))
+
+        return files
+
+    def _scan_folder(
+        self, dir_path: str, rel_prefix: str, prune: re.Pattern[str] | None, skip_hidden: bool
+    ) -> tuple[list[tuple[str, str, bool]], list[tuple[str, str]]]:
+        """
+        Reads a single folder for `_walk`.
+
+        Directory entries come from `os.scandir`, whose cached file types avoid a stat call per entry and whose
+        paths are kept so readers need not join them onto the walked folder again.
+
+        Args:
+            dir_path: The folder to read.
+            rel_prefix: The relative path of `dir_path` including a trailing slash, prepended to every entry name.
+            prune: Subfolders whose relative path, including the trailing slash, matches this pattern are left out.
+            skip_hidden: If True, entries whose name starts with "." are left out before any pattern is matched.
+
+        Returns:
+            The (relative path, path, is file) of every non-folder entry, and the (path, relative prefix) of every subfolder to walk.
+        """
+        files = []
+        subfolders = []
+
+        with os.scandir(dir_path) as entries:
+            for entry in entries:
+                if skip_hidden and entry.name[0] == ".":
+                    continue
+
+                if not entry.is_dir():
+                    files.append((rel_prefix + entry.name, entry.path, entry.is_file()))
+                    continue
+
+                # Like os.walk, do not descend into links to folders
+                if entry.is_symlink():
+                    continue
+
+                if prune and entry.name in DEFAULT_SKIP_DIR_NAMES:
+                    logger.debug("Skipping folder due to folder exclusions: %s%s/", rel_prefix, entry.name)
+                    continue
+
+                child_prefix = entry.name + "/" if rel_prefix == "./" else rel_prefix + entry.name + "/"
+                if prune and prune.match(child_prefix):
+                    logger.debug("Skipping folder due to folder exclusions: %s", child_prefix)
+                    continue
+
+                subfolders.append((entry.path, child_prefix))
+
+        return files, subfolders
 
     async def read_all(
         self,
@@ -508,52 +865,133 @@ class FolderOperations(MCPMixin):
             MCPFolderNotFoundError: If `folder_path` does not exist or is not a directory.
             MCPFolderOperationError: For permission errors accessing the top-level folder. Individual file read errors are captured in the `errors` list within the result.
         """
-        async with handle_folder_errors(folder_path):
-            files = await self.contents(folder_path, include, exclude, recurse, bypass_default_exclusions)
-            unfiltered_file_count = len(await self.contents(folder_path, [], [], recurse, bypass_default_exclusions))
+        with handle_folder_errors(folder_path):
+            files, unfiltered_file_count = await asyncio.to_thread(
+                self._list_contents,
+                folder_path,
+                include,
+                exclude,
+                recurse=recurse,
+                bypass_default_exclusions=bypass_default_exclusions,
+                files_only=True,
+            )
 
-            results: list[FileReadSuccess] = []
-            errors: list[FileReadError] = []
+            outcomes = [outcome async for outcome in self._read_files(files, head, tail, bypass_default_exclusions)]
 
-            for file in files:
-                file_path = os.path.join(folder_path, file)
+            # Reads finish in any order; report them in listing order
+            listing_order = {file: index for index, (file, _) in enumerate(files)}
+            outcomes.sort(key=lambda outcome: listing_order[outcome.file_path])
 
-                if not bypass_default_exclusions:
-                    # Check if the file matches any default exclusion patterns
-                    if not self._matches_globs(file, include=["*"], exclude=self.read_file_exclusions):
-                        logger.debug(f"Skipping file due to exclusion: {file_path}")
-                        continue
+            results = [outcome for outcome in outcomes if isinstance(outcome, FileReadSuccess)]
+            errors = [outcome for outcome in outcomes if isinstance(outcome, FileReadError)]
 
-                if not os.path.isfile(file_path):
-                    continue
-                try:
-                    with open(file_path, encoding="utf-8", errors="strict") as f:
-                        if head > 0:
-                            content = "".join(f.readlines()[:head])
-                        elif tail > 0:
-                            f.seek(0, os.SEEK_END)
-                            f.seek(max(0, f.tell() - tail), os.SEEK_SET)
-                            content = f.read()
-                        else:
-                            content = f.read()
-                    results.append(FileReadSuccess(file_path=file, content=content))
-                    logger.debug(f"File read successfully: {file_path}")
-                except Exception as e:
-                    errors.append(FileReadError(file_path=file, error=str(e)))
-                    logger.error(f"Error reading file {file_path}: {e}")
-
-            summary = FileReadSummary(
+            summary = FileReadSummary.model_construct(
                 total_files=len(files),
                 skipped_files=unfiltered_file_count - len(files),
                 errors=errors,
                 results=results,
             )
-            file_size = len(summary.model_dump_json())
+            # Approximates the size handed to the LLM without serializing every file's content just for this log line
+            content_size = sum(len(result.content) for result in results) + sum(len(error.error) for error in errors)
             logger.info(
-                f"File read summary: {file_size} bytes provided to LLM, {summary.total_files} files read, {summary.skipped_files} skipped, {len(summary.errors)} errors"
+                f"File read summary: ~{content_size} characters provided to LLM, "
+                f"{summary.total_files} files read, {summary.skipped_files} skipped, {len(summary.errors)} errors"
             )
             return summary
 
+    async def iter_read_all(  # noqa: PLR0913
+        self,
+        folder_path: str,
+        include: list[str],
+        exclude: list[str],
+        *,
+        recurse: bool,
+        head: int = 0,
+        tail: int = 0,
+        bypass_default_exclusions: bool = False,
+    ) -> AsyncIterator[FileReadSuccess | FileReadError]:
+        """
+        Reads the files `read_all` would, yielding each result or error as soon as its file has been read.
+
+        At most `READ_ALL_CONCURRENCY` files are read ahead of the caller, so stopping early leaves the
+        remaining files unread and only a bounded number of file contents is held at once.
+
+        Args:
+            folder_path: The relative or absolute path of the folder to read files from.
+            include: A list of glob patterns. Only files whose relative paths match any of these patterns are included.
+            exclude: A list of glob patterns. Files whose relative paths match any of these patterns are excluded.
+            recurse: If True, reads files in subdirectories recursively.
+            head: If > 0, reads only the first `head` lines from each file. Overrides `tail`.
+            tail: If > 0 and `head` is 0, reads only the last `tail` lines from each file.
+            bypass_default_exclusions: If True, ignores the built-in `read_file_exclusions`.
+
+        Yields:
+            FileReadSuccess | FileReadError: The outcome of reading each file, in the order the reads finish.
+
+        Raises:
+            MCPFolderNotFoundError: If `folder_path` does not exist or is not a directory.
+            MCPFolderOperationError: For permission errors accessing the top-level folder.
+        """
+        with handle_folder_errors(folder_path):
+            files, _ = await asyncio.to_thread(
+                self._list_contents,
+                folder_path,
+                include,
+                exclude,
+                recurse=recurse,
+                bypass_default_exclusions=bypass_default_exclusions,
+                files_only=True,
+            )
+
+        async for outcome in self._read_files(files, head, tail, bypass_default_exclusions):
+            yield outcome
+
+    async def _read_files(
+        self, files: list[tuple[str, str]], head: int, tail: int, bypass_default_exclusions: bool
+    ) -> AsyncIterator[FileReadSuccess | FileReadError]:
+        """
+        Reads the listed (relative path, path) files in worker threads, yielding each outcome as its read finishes.
+
+        Only `READ_ALL_CONCURRENCY` reads are in flight at a time; the next ones start as the caller consumes outcomes.
+        """
+        remaining = iter(files)
+        pending: set[asyncio.Task[FileReadSuccess | FileReadError]] = set()
+
+        try:
+            while True:
+                for file, file_path in remaining:
+                    if not bypass_default_exclusions:
+                        # Check if the file matches any default exclusion patterns
+                        if self._is_excluded(file, self._read_file_exclusions_re, self._read_file_excluded_suffixes):
+                            logger.debug("Skipping file due to exclusion: %s", file_path)
+                            continue
+
+                    pending.add(asyncio.create_task(self._read_one(file, file_path, head, tail)))
+                    if len(pending) >= READ_ALL_CONCURRENCY:
+                        break
+
+                if not pending:
+                    return
+
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    yield task.result()
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def _read_one(self, file: str, file_path: str, head: int, tail: int) -> FileReadSuccess | FileReadError:
+        """Reads a single file for `_read_files`, capturing any failure as a FileReadError."""
+        try:
+            content = await asyncio.to_thread(_read_file, file_path, head, tail)
+        except Exception as e:
+            logger.error("Error reading file %s: %s", file_path, e)
+            return FileReadError.model_construct(file_path=file, error=str(e))
+
+        logger.debug("File read successfully: %s", file_path)
+        # The fields are known to be strings, so skip validating a model per file
+        return FileReadSuccess.model_construct(file_path=file, content=content)
+
     async def move(self, source_path: str, destination_path: str) -> bool:
         """
         Moves or renames a folder (directory).
@@ -572,8 +1010,8 @@ class FolderOperations(MCPMixin):
             MCPFolderOperationError: For permission errors, if `destination_path` already exists,
                                      or other issues during the move operation.
         """
-        async with handle_folder_errors(source_path):
-            os.rename(source_path, destination_path)
+        with handle_folder_errors(source_path):
+            await asyncio.to_thread(_move, source_path, destination_path)
             logger.info(f"Folder moved from {source_path} to {destination_path}")
             return True
 
@@ -599,7 +1037,7 @@ class FolderOperations(MCPMixin):
                                      and `recursive` is False, or for permission errors or
                                      other issues during deletion.
         """
-        async with handle_folder_errors(folder_path):
+        with handle_folder_errors(folder_path):
             if recursive:
                 shutil.rmtree(folder_path)
             else:
@@ -1,17 +1,22 @@
 import asyncio
 import json
-from collections.abc import Callable
+import logging
+from collections.abc import Callable, Collection
 from enum import Enum
 import sys
+import time
 from typing import Any, Literal
 
+from google.api_core.exceptions import RetryError
 from google.api_core.retry import if_transient_error
 from google.api_core.retry_async import AsyncRetry
 from google.genai.client import AsyncClient, Client
 from google.genai.errors import ClientError, ServerError
 from google.genai.types import (
+    CachedContent,
     Content,
     ContentListUnion,
+    CreateCachedContentConfig,
     FunctionCall,
     FunctionCallingConfig,
     FunctionCallingConfigMode,
@@ -35,11 +40,57 @@ from gemini_for_github.errors.genai import (
 )
 from gemini_for_github.shared.logging import BASE_LOGGER
 
+INVALID_ARGUMENT_ERROR_CODE = 400
 QUOTA_EXCEEDED_ERROR_CODE = 429
 MODEL_OVERLOADED_ERROR_CODE = 503
 INTERNAL_ERROR_CODE = 500
 
 MAX_ITERATIONS = 15
+MAX_CONCURRENT_REQUESTS = 8
+
+REPORT_TOOLS = frozenset({"report_completion", "report_failure"})
+"""Tools the model calls to end a task; the other calls of the same turn still run before the task ends"""
+
+CONTEXT_CACHE_TTL_SECONDS = 900
+CONTEXT_CACHE_REFRESH_MARGIN_SECONDS = 60
+
+SAFETY_SETTINGS: tuple[SafetySetting, ...] = tuple(
+    SafetySetting(category=category, threshold=HarmBlockThreshold.BLOCK_MEDIUM_AND_ABOVE)
+    for category in (
+        HarmCategory.HARM_CATEGORY_HARASSMENT,
+        HarmCategory.HARM_CATEGORY_HATE_SPEECH,
+        HarmCategory.HARM_CATEGORY_SEXUALLY_EXPLICIT,
+        HarmCategory.HARM_CATEGORY_DANGEROUS_CONTENT,
+        HarmCategory.HARM_CATEGORY_CIVIC_INTEGRITY,
+    )
+)
+"""Safety settings sent with every request, built once rather than per completion"""
+
+THINKING_CONFIG = ThinkingConfig(thinking_budget=2048)
+"""Thinking budget of requests when thinking is enabled"""
+
+TOOL_CONFIG = ToolConfig(function_calling_config=FunctionCallingConfig(mode=FunctionCallingConfigMode.ANY))
+"""Tool config of every request and context cache: the model must always call a tool"""
+
+_PARAMETER_SCHEMAS: dict[Callable[..., Any], dict[str, Any]] = {}
+"""Tool function (the underlying function of a bound method) -> JSON schema of its parameters"""
+
+
+def _get_parameters_schema(function: Callable[..., Any]) -> dict[str, Any]:
+    """
+    Returns the JSON schema of a tool function's parameters, generated once per function.
+
+    Bound methods are keyed by their underlying function, so every instance of a client shares the schema of
+    its tools instead of building a pydantic core schema again. Callers must not modify the returned schema.
+    """
+    key = getattr(function, "__func__", function)
+
+    if (schema := _PARAMETER_SCHEMAS.get(key)) is None:
+        schema = TypeAdapter(function).json_schema()
+        schema.pop("additionalProperties")
+        _PARAMETER_SCHEMAS[key] = schema
+
+    return schema
 
 
 def is_retryable(e) -> bool:
@@ -92,13 +143,23 @@ class GenAIClient:
     request_counter: int = 0
     declared_tools: dict[str, tuple[Tool, Callable[..., Any]]]
 
-    def __init__(self, api_key: str, model: str = "gemini-2.5-flash-preview-04-17", temperature: float = 0.2, thinking: bool = True):
+    def __init__(
+        self,
+        api_key: str,
+        model: str = "gemini-2.5-flash-preview-04-17",
+        temperature: float = 0.2,
+        thinking: bool = True,
+        context_caching: bool = False,
+    ):
         """Initialize the GenAI client.
 
         Args:
             api_key: Google AI API key.
             model: Name of the specific Gemini model to use (e.g., "gemini-2.5-flash-preview-04-17").
             temperature: Model temperature for controlling randomness in generation.
+            context_caching: Store the system prompt and tool declarations of a task in a Gemini context
+                             cache so that each completion only sends the conversation. Off by default, as
+                             cached content is billed for storage.
         """
 
         self.client: AsyncClient = Client(api_key=api_key).aio
@@ -111,6 +172,18 @@ class GenAIClient:
             "google_search": GoogleSearch(),  # type: ignore
         }
         self.tool_call_history = []
+        self._request_semaphore = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+
+        self.cacheable_tools: set[str] = set()
+        self._tool_response_cache: dict[tuple[str, str], FunctionResponse] = {}
+        """(tool name, normalized arguments) -> response of a read-only tool"""
+
+        self._tool_schemas: dict[tuple[str, ...], list[Tool]] = {}
+        """Sorted tool names -> tool list sent to the model, built once per set of tools"""
+
+        self.context_caching = context_caching
+        self._context_caches: dict[tuple[str, tuple[str, ...]], tuple[str | None, float]] = {}
+        """(system prompt, tool names) -> (cached content name or None if caching failed, refresh deadline)"""
 
         self.register_tool("report_completion", self.report_completion)
         self.register_tool("report_failure", self.report_failure)
@@ -166,11 +239,13 @@ class GenAIClient:
     def register_tool_with_declaration(self, name: str, function: Callable[..., Any], function_declaration: FunctionDeclaration):
         tool = Tool(function_declarations=[function_declaration])
         self.declared_tools[name] = (tool, function)
+        self._tool_schemas.clear()
 
     def add_native_tool(self, name: str, tool: Tool):
         self.native_tools[name] = tool
+        self._tool_schemas.clear()
 
-    def register_tool(self, name: str, function: Callable[..., Any]):
+    def register_tool(self, name: str, function: Callable[..., Any], cacheable: bool = False):
         """
         Registers a Python function as a tool available to the LLM, automatically generating the schema.
 
@@ -184,9 +259,15 @@ class GenAIClient:
             function: The Python callable (function or method) to execute. Must have type hints
                       for its arguments and a clear docstring explaining its purpose, arguments,
                       and what it returns.
+            cacheable: Whether the tool only reads state. Responses of cacheable tools are reused for
+                       repeated calls with the same arguments until a non-cacheable tool is called.
         """
-        schema = TypeAdapter(function).json_schema()
-        schema.pop("additionalProperties")
+        if cacheable:
+            self.cacheable_tools.add(name)
+        else:
+            self.cacheable_tools.discard(name)
+
+        schema = _get_parameters_schema(function)
 
         self.register_tool_with_declaration(
             name,
@@ -198,6 +279,17 @@ class GenAIClient:
             ),
         )
 
+    def register_tools(self, tools: dict[str, Callable[..., Any]], cacheable_tools: Collection[str] = ()):
+        """
+        Registers every tool returned by a client's `get_tools()`.
+
+        Args:
+            tools: A mapping of tool name to the Python callable implementing the tool.
+            cacheable_tools: The names of the tools that only read state, see `register_tool`.
+        """
+        for name, function in tools.items():
+            self.register_tool(name, function, cacheable=name in cacheable_tools)
+
     def _debug(self, msg: str):
         logger.debug(f"Request {self.request_counter}: {msg}")
 
@@ -216,18 +308,68 @@ class GenAIClient:
 
         function_args = function_args or {}
 
+        cache_key: tuple[str, str] | None = None
+
+        if function_name in self.cacheable_tools:
+            cache_key = (function_name, json.dumps(function_args, sort_keys=True, default=str))
+            if cached_response := self._tool_response_cache.get(cache_key):
+                logger.info(f"Reusing cached response for read-only tool {function_name}")
+                return cached_response
+        else:
+            # Any tool that may change state invalidates every cached read
+            self._tool_response_cache.clear()
+
         try:
             if asyncio.iscoroutinefunction(tool_function):
                 output = await tool_function(**function_args)
             else:
-                output = tool_function(**function_args)
+                # Run blocking tools (GitHub API, git, web requests) off the event loop so concurrent tasks overlap
+                output = await asyncio.to_thread(tool_function, **function_args)
 
         except Exception as e:
             msg = f"Error executing function {function_name}: {e}"
             logger.exception(msg)
             return FunctionResponse(name=function_name, response={"error": str(e)})
 
-        return FunctionResponse(name=function_name, response={"output": output})
+        function_response = FunctionResponse(name=function_name, response={"output": output})
+
+        if cache_key:
+            self._tool_response_cache[cache_key] = function_response
+
+        return function_response
+
+    async def _handle_function_calls(self, function_calls: list[FunctionCall]) -> list[FunctionResponse]:
+        """Handle the function calls of a single model turn and return their responses, in the same order.
+
+        Consecutive calls to read-only tools run concurrently. Calls to any other tool run one at a time, in
+        the order the model made them, since they may change state the calls around them depend on.
+
+        Args:
+            function_calls: The function calls from the model, each with a name
+
+        Returns:
+            list[FunctionResponse]: The response to each function call
+        """
+        function_responses: list[FunctionResponse] = []
+        read_only_calls: list[FunctionCall] = []
+
+        for function_call in function_calls:
+            if function_call.name in self.cacheable_tools:
+                read_only_calls.append(function_call)
+                continue
+
+            function_responses.extend(await self._gather_function_calls(read_only_calls))
+            read_only_calls = []
+
+            function_responses.append(await self._handle_function_call(function_call.name, function_call.args))  # type: ignore
+
+        function_responses.extend(await self._gather_function_calls(read_only_calls))
+
+        return function_responses
+
+    async def _gather_function_calls(self, function_calls: list[FunctionCall]) -> list[FunctionResponse]:
+        """Handle function calls concurrently and return their responses, in the same order."""
+        return await asyncio.gather(*(self._handle_function_call(call.name, call.args) for call in function_calls))  # type: ignore
 
     def _handle_completion(self, args: dict[str, Any] | None, response: GenerateContentResponse) -> GenAITaskSuccess:
         if not args:
@@ -270,58 +412,118 @@ class GenAIClient:
         )
 
     def _get_safety_settings(self) -> list[SafetySetting]:
-        return [
-            SafetySetting(
-                category=HarmCategory.HARM_CATEGORY_HARASSMENT,
-                threshold=HarmBlockThreshold.BLOCK_MEDIUM_AND_ABOVE,
-            ),
-            SafetySetting(
-                category=HarmCategory.HARM_CATEGORY_HATE_SPEECH,
-                threshold=HarmBlockThreshold.BLOCK_MEDIUM_AND_ABOVE,
-            ),
-            SafetySetting(
-                category=HarmCategory.HARM_CATEGORY_SEXUALLY_EXPLICIT,
-                threshold=HarmBlockThreshold.BLOCK_MEDIUM_AND_ABOVE,
-            ),
-            SafetySetting(
-                category=HarmCategory.HARM_CATEGORY_DANGEROUS_CONTENT,
-                threshold=HarmBlockThreshold.BLOCK_MEDIUM_AND_ABOVE,
-            ),
-            SafetySetting(
-                category=HarmCategory.HARM_CATEGORY_CIVIC_INTEGRITY,
-                threshold=HarmBlockThreshold.BLOCK_MEDIUM_AND_ABOVE,
-            )
-        ]
+        return list(SAFETY_SETTINGS)
 
-    def _detect_function_call(self, response: GenerateContentResponse) -> FunctionCall | None:
+    def _detect_function_calls(self, response: GenerateContentResponse) -> list[FunctionCall]:
+        """Returns every function call of the first candidate, in order; the model may make several in one turn."""
         if response.candidates and len(response.candidates) > 0:
             candidate = response.candidates[0]
 
             if not candidate.content or not candidate.content.parts:
-                return None
+                return []
+
+            return [part.function_call for part in candidate.content.parts if part.function_call]
 
-            for part in candidate.content.parts:
-                if not part.function_call:
-                    continue
-                return part.function_call
+        return []
 
-        return None
+    def _get_tool_config(self) -> ToolConfig:
+        return TOOL_CONFIG
 
-    def _get_generate_content_config(self, system_prompt: str, tools: list[Tool] | None = None) -> GenerateContentConfig:
+    def _get_generate_content_config(
+        self, system_prompt: str, tools: list[Tool] | None = None, cached_content: str | None = None
+    ) -> GenerateContentConfig:
         safety_settings = self._get_safety_settings()
 
+        if cached_content:
+            # The system prompt, tools and tool config live in the cached content and must not be resent
+            return GenerateContentConfig(
+                temperature=self.temperature,
+                max_output_tokens=4096,
+                safety_settings=safety_settings,
+                cached_content=cached_content,
+                thinking_config=THINKING_CONFIG if self.thinking else None,
+            )
+
         return GenerateContentConfig(
             temperature=self.temperature,
             max_output_tokens=4096,
             tools=tools,  # type: ignore
             safety_settings=safety_settings,
             system_instruction=system_prompt,
-            thinking_config=ThinkingConfig(thinking_budget=2048) if self.thinking else None,
-            tool_config=ToolConfig(
-                function_calling_config=FunctionCallingConfig(mode=FunctionCallingConfigMode.ANY),
-            ),
+            thinking_config=THINKING_CONFIG if self.thinking else None,
+            tool_config=self._get_tool_config(),
         )
 
+    async def _get_cached_content(self, system_prompt: str, tool_names: tuple[str, ...], tools: list[Tool]) -> str | None:
+        """
+        Returns the name of a Gemini context cache holding the system prompt and tool declarations for a task.
+
+        The cache is created on first use and recreated shortly before its TTL expires; `perform_task` deletes
+        it once the task ends. If the model or the prompt does not qualify for caching (e.g. it is below the
+        minimum cacheable token count), the failure is remembered and the full prompt is sent with every
+        request instead. Other failures only skip the cache for the current request.
+        """
+        if not self.context_caching:
+            return None
+
+        key = (system_prompt, tool_names)
+
+        if cached := self._context_caches.get(key):
+            name, refresh_at = cached
+            if name is None or time.monotonic() < refresh_at:
+                return name
+
+            # The cache is about to expire, replace it rather than paying for both until then
+            del self._context_caches[key]
+            await self._delete_cached_content(name)
+
+        try:
+            cache = await self._create_cached_content(system_prompt, tools)
+        except (ClientError, ServerError, RetryError) as e:
+            if isinstance(e, ClientError) and e.code == INVALID_ARGUMENT_ERROR_CODE:
+                logger.warning(f"Context caching unavailable, sending the full prompt with each request: {e}")
+                self._context_caches[key] = (None, 0)
+            else:
+                logger.warning(f"Could not create a context cache, sending the full prompt with this request: {e}")
+            return None
+
+        logger.info(f"Created context cache {cache.name} for {len(tool_names)} tools")
+
+        refresh_at = time.monotonic() + CONTEXT_CACHE_TTL_SECONDS - CONTEXT_CACHE_REFRESH_MARGIN_SECONDS
+        self._context_caches[key] = (cache.name, refresh_at)
+
+        return cache.name
+
+    @AsyncRetry(predicate=is_retryable)
+    async def _create_cached_content(self, system_prompt: str, tools: list[Tool]) -> CachedContent:
+        async with self._request_semaphore:
+            return await self.client.caches.create(
+                model=self.model,
+                config=CreateCachedContentConfig(
+                    system_instruction=system_prompt,
+                    tools=tools,
+                    tool_config=self._get_tool_config(),
+                    ttl=f"{CONTEXT_CACHE_TTL_SECONDS}s",
+                ),
+            )
+
+    async def _delete_cached_content(self, name: str) -> None:
+        """Deletes a context cache, leaving it to expire after its TTL if the deletion fails."""
+        try:
+            await self.client.caches.delete(name=name)
+        except (ClientError, ServerError) as e:
+            logger.warning(f"Could not delete context cache {name}, it will expire after its TTL: {e}")
+            return
+
+        logger.info(f"Deleted context cache {name}")
+
+    async def _delete_context_caches(self) -> None:
+        """Deletes every context cache created by the client, keeping the record of prompts that cannot be cached."""
+        for key, (name, _) in list(self._context_caches.items()):
+            if name is not None:
+                del self._context_caches[key]
+                await self._delete_cached_content(name)
+
     def get_allowed_tools(self, tool_names: list[str]) -> list[tuple[str, Tool]]:
         allowed_tools = []
 
@@ -336,6 +538,29 @@ class GenAIClient:
                 raise ValueError(f"Tool {name} not found")
         return allowed_tools
 
+    def _get_tool_schema(self, tool_names: tuple[str, ...]) -> list[Tool]:
+        """
+        Returns the tool list sent to the model for the given (sorted) tool names.
+
+        The function declarations of all declared tools are merged into a single `Tool`, followed by
+        the native tools. The list is built once per set of tool names and reused by every request, so
+        the tool prefix of the prompt is identical across requests.
+        """
+        if (schema := self._tool_schemas.get(tool_names)) is None:
+            function_declarations: list[FunctionDeclaration] = []
+            native_tools: list[Tool] = []
+
+            for name, tool in self.get_allowed_tools(list(tool_names)):
+                if name in self.declared_tools:
+                    function_declarations.extend(tool.function_declarations or [])
+                else:
+                    native_tools.append(tool)
+
+            schema = [Tool(function_declarations=function_declarations), *native_tools]
+            self._tool_schemas[tool_names] = schema
+
+        return schema
+
     def log_conversation_summary(self, contents: list[Content]):
         for index, content in enumerate(contents):
             if not content.role or not content.parts:
@@ -374,17 +599,21 @@ class GenAIClient:
         system_prompt: str,
         contents: ContentListUnion,
         tools: list[Tool],
+        cached_content: str | None = None,
     ) -> GenerateContentResponse:
-        generation_config = self._get_generate_content_config(system_prompt, tools)
-
-        self._debug(f"System prompt: {system_prompt}")
-        self._debug(f"Contents: {contents}")
-
-        return await self.client.models.generate_content(
-            model=self.model,
-            contents=contents,
-            config=generation_config,
-        )
+        generation_config = self._get_generate_content_config(system_prompt, tools, cached_content)
+
+        # Rendering the whole conversation is expensive, only do it when it will actually be logged
+        if logger.isEnabledFor(logging.DEBUG):
+            self._debug(f"System prompt: {system_prompt}")
+            self._debug(f"Contents: {contents}")
+
+        async with self._request_semaphore:
+            return await self.client.models.generate_content(
+                model=self.model,
+                contents=contents,
+                config=generation_config,
+            )
 
     @classmethod
     def new_user_content(cls, user_prompt: str) -> Content:
@@ -444,67 +673,92 @@ class GenAIClient:
             ValueError: If an unknown tool name is provided in `allowed_tools`.
             Other exceptions from the underlying API calls or tool executions.
         """
+        try:
+            return await self._perform_task(system_prompt, content_list, allowed_tools)
+        finally:
+            # Context caches are billed until their TTL runs out, don't keep them past the task
+            await self._delete_context_caches()
 
+    async def _perform_task(self, system_prompt: str, content_list: list[Content], allowed_tools: list[str]) -> GenAITaskResult:
+        """Runs the model and tool loop of `perform_task`."""
         iteration = 0
 
-        provided_tool_names: list[str]
-        provided_tools: list[Tool]
+        # Cached responses may be stale once a previous task has changed the repository
+        self._tool_response_cache.clear()
 
-        provided_tool_names, provided_tools = zip(
-            *self.get_allowed_tools([*allowed_tools, "report_completion", "report_failure", *self.native_tools.keys()]), strict=True
+        provided_tool_names: tuple[str, ...] = tuple(
+            sorted({*allowed_tools, "report_completion", "report_failure", *self.native_tools.keys()})
         )
+        provided_tools: list[Tool] = self._get_tool_schema(provided_tool_names)
 
-        logger.info(f"Performing task with provided tools: {provided_tool_names}")
+        logger.info(f"Performing task with provided tools: {', '.join(provided_tool_names)}")
 
         while iteration < MAX_ITERATIONS:
             logger.info(f"Model completion iteration {iteration}")
 
             iteration += 1
-            
-            response = await self._get_completion(system_prompt=system_prompt, contents=content_list, tools=provided_tools)  # type: ignore
 
-            logger.debug(f"Model completion response: {response}")
+            cached_content = await self._get_cached_content(system_prompt, provided_tool_names, provided_tools)
+
+            response = await self._get_completion(
+                system_prompt=system_prompt,
+                contents=content_list,
+                tools=provided_tools,
+                cached_content=cached_content,
+            )
 
-            function_call = self._detect_function_call(response)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"Model completion response: {response}")
 
-            if not function_call:
+            function_calls = self._detect_function_calls(response)
+
+            if not function_calls:
                 logger.error("No function call detected. Asking for completion again.")
                 self._print_last_response(response)
                 continue
 
-            logger.info(f"Function call detected: {function_call.name} with args: {function_call.args}")
+            for function_call in function_calls:
+                logger.info(f"Function call detected: {function_call.name} with args: {function_call.args}")
 
-            self.tool_call_history.append(function_call.name)
+                self.tool_call_history.append(function_call.name)
 
-            if not function_call.name:
+            if not all(function_call.name for function_call in function_calls):
                 msg = "Function call name is missing but tool calls are required. Asking for completion again."
                 logger.error(msg)
                 self._print_last_response(response)
                 continue
                 #raise GenAITaskUnknownStatusError(msg)
 
-            if function_call.name == "report_completion":
-                self.log_conversation_summary(content_list)
-                return self._handle_completion(function_call.args, response)
-            if function_call.name == "report_failure":
+            report_calls = [function_call for function_call in function_calls if function_call.name in REPORT_TOOLS]
+
+            if report_calls:
+                # Carry out the rest of the turn first, so calls made alongside the report are not dropped
+                await self._handle_function_calls([call for call in function_calls if call.name not in REPORT_TOOLS])
+
                 self.log_conversation_summary(content_list)
-                return self._handle_failure(function_call.args, response)
 
-            function_response = await self._handle_function_call(function_call.name, function_call.args)
+                report_call = report_calls[0]
+                if report_call.name == "report_completion":
+                    return self._handle_completion(report_call.args, response)
+                return self._handle_failure(report_call.args, response)
+
+            function_responses = await self._handle_function_calls(function_calls)
 
-            if sys.getsizeof(function_response.response) > 1048576:  # noqa: PLR2004
-                logger.warning(f"Function response is too large (>1MB) to be processed: {function_response.response}")
-                function_response = FunctionResponse(
-                    name=function_call.name,
-                    response={
-                        "error": "Response is too large to be processed. Perform your tool call in a way that returns less data.",
-                    },
-                )
+            for index, function_response in enumerate(function_responses):
+                if sys.getsizeof(function_response.response) > 1048576:  # noqa: PLR2004
+                    logger.warning(f"Function response is too large (>1MB) to be processed: {function_response.response}")
+                    function_responses[index] = FunctionResponse(
+                        name=function_response.name,
+                        response={
+                            "error": "Response is too large to be processed. Perform your tool call in a way that returns less data.",
+                        },
+                    )
 
+            # All calls of the turn go back as one model turn, answered by one user turn with every response
             content_list = [
                 *list(content_list),  # type: ignore
-                Content(role="model", parts=[Part(function_call=function_call)]),
-                Content(role="user", parts=[Part(function_response=function_response)]),
+                Content(role="model", parts=[Part(function_call=function_call) for function_call in function_calls]),
+                Content(role="user", parts=[Part(function_response=function_response) for function_response in function_responses]),
             ]
 
         self.log_conversation_summary(content_list)
@@ -1,7 +1,9 @@
+from collections.abc import Callable, Coroutine
 from typing import Any
 
 from fastmcp.client import Client
 from fastmcp.client.transports import StdioTransport
+from mcp.types import Tool as MCPTool
 from pydantic import Field
 
 from gemini_for_github.errors.mcp import MCPServerDisabledError, MCPServerNotConnectedError, MCPServerNotInitializedError
@@ -10,6 +12,19 @@ from gemini_for_github.shared.logging import BASE_LOGGER
 logger = BASE_LOGGER.getChild("mcp")
 
 
+def _create_tool_function(server: "MCPServer", tool: MCPTool) -> Callable[..., Coroutine[Any, Any, Any]]:
+    """Builds a named, documented wrapper that forwards a call to `tool` on `server`."""
+    args: dict[str, Any] = Field(..., json_schema_extra=tool.inputSchema)
+
+    async def tool_function(tool_args: dict[str, Any] = args):
+        return await server.call_tool(tool.name, tool_args)
+
+    tool_function.__name__ = tool.name
+    tool_function.__doc__ = tool.description
+
+    return tool_function
+
+
 class MCPServer:
     """
     Manages a connection to a Model Context Protocol (MCP) server.
@@ -18,6 +33,7 @@ class MCPServer:
     """
 
     client: Client
+    _tools: dict[str, Callable[..., Coroutine[Any, Any, Any]]] | None = None
 
     def __init__(self, name: str, command: str, args: list[str], env: dict[str, str], disabled: bool):
         """Initializes the MCPServer instance.
@@ -77,19 +93,19 @@ class MCPServer:
         return await self.client.call_tool(tool_name, tool_args)
 
     async def get_tools(self):
-        await self._verify_ready()
-        tools = await self.list_tools()
-
-        for tool in tools:
-            args: dict[str, Any] = Field(..., json_schema_extra=tool.inputSchema)
+        """
+        Returns a wrapper function for every tool offered by the server, keyed by tool name.
 
-            def tool_function(tool_args: dict[str, Any] = args):
-                return self.call_tool(tool.name, tool_args)
+        The tool list is fetched and the wrappers are built on the first call only; later calls
+        return the same wrappers.
+        """
+        await self._verify_ready()
 
-            tool_function.__name__ = tool.name
-            tool_function.__doc__ = tool.description
+        if self._tools is None:
+            tools = await self.list_tools()
+            self._tools = {tool.name: _create_tool_function(self, tool) for tool in tools}
 
-        return {tool.name: tool_function for tool in tools}
+        return self._tools
 
     async def stop(self):
         await self._verify_ready()
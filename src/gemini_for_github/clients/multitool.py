@@ -106,7 +106,7 @@ class BulkToolCaller(MCPMixin):
         Returns:
             list[CallToolRequestResult]: A list of CallToolRequestResult objects, each containing the result of a tool call.
         """
-        results = []
+        calls: list[tuple[str, dict[str, Any]]] = []
 
         for tool_call in tool_calls:
             if not (tool := tool_call.get("tool")):
@@ -115,14 +115,9 @@ class BulkToolCaller(MCPMixin):
             if not (arguments := tool_call.get("arguments")):
                 raise ValueError("Arguments are required")
 
-            result = await self._call_tool(tool, arguments)
+            calls.append((tool, arguments))
 
-            results.append(result)
-
-            if result.isError and not continue_on_error:
-                return results
-
-        return results
+        return await self._call_tools(calls, continue_on_error)
 
     @mcp_tool()
     async def call_tool_bulk(
@@ -156,31 +151,42 @@ class BulkToolCaller(MCPMixin):
             }
             ]
         """
-        results = []
+        calls = [(tool, tool_call_arguments) for tool_call_arguments in tool_arguments]
 
-        for tool_call_arguments in tool_arguments:
-            result = await self._call_tool(tool, tool_call_arguments)
+        return await self._call_tools(calls, continue_on_error)
 
-            results.append(result)
+    async def _call_tools(
+        self, calls: list[tuple[str, dict[str, Any]]], continue_on_error: bool
+    ) -> list[CallToolRequestResult]:
+        """
+        Helper method to run a batch of tool calls over a single client session.
 
-            if result.isError and not continue_on_error:
-                return results
+        The calls run in order, as a batch may hold calls that change state the later calls depend on.
+        Unless `continue_on_error` is set, the batch stops after the first failing call.
+        """
+
+        async with Client(self.connection) as client:
+            results = []
 
-        return results
+            for tool, arguments in calls:
+                result = await self._call_tool(client, tool, arguments)
+
+                results.append(result)
+
+                if result.isError and not continue_on_error:
+                    break
+
+            return results
 
     async def _call_tool(
-        self, tool: str, arguments: dict[str, Any]
+        self, client: Client, tool: str, arguments: dict[str, Any]
     ) -> CallToolRequestResult:
         """
         Helper method to call a tool with the provided arguments.
         """
 
-        async with Client(self.connection) as client:
-            result = await client.call_tool_mcp(name=tool, arguments=arguments)
-
-            return CallToolRequestResult(
-                tool=tool,
-                arguments=arguments,
-                isError=result.isError,
-                content=result.content,
-            )
+        result = await client.call_tool_mcp(name=tool, arguments=arguments)
+
+        return CallToolRequestResult.from_call_tool_result(
+            result, tool=tool, arguments=arguments
+        )
@@ -1,10 +1,14 @@
-from collections.abc import Callable
+from collections.abc import Callable, Iterator
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 from gemini_for_github.shared.logging import BASE_LOGGER
 
 logger = BASE_LOGGER.getChild("project")
 
+README_READ_WORKERS = 16
+"""Maximum number of README files read at once by ProjectClient.read_readmes"""
+
 
 class ProjectClient:
     """
@@ -59,45 +63,56 @@ class ProjectClient:
                             }
                             ```
         """
-        readmes = {}
+        readmes: dict[str, str] = {}
 
-        # Start with root readmes
-        # Using Path.cwd() to be explicit about the starting point.
-        for file in Path.cwd().glob("*.md"):
-            if len(readmes) >= 100:  # noqa: PLR2004
-                logger.info("Reached maximum limit of 100 READMEs. Stopping root scan.")
-                break
-            try:
-                with open(file, encoding="utf-8") as f:
-                    content = f.read()
-                if len(content) > 1024:  # noqa: PLR2004
-                    logger.warning(f"README '{file.name}' is too large (>1KB), truncating.")
-                    readmes[file.name] = content[:1024]
-                else:
-                    readmes[file.name] = content
-            except Exception as e:
-                logger.error(f"Could not read root README '{file.name}': {e}")
-
-
-        # Then scan subdirectories for other Markdown files
-        for file in Path.cwd().glob("**/*.md"):
-            if len(readmes) >= 100:  # noqa: PLR2004
-                logger.info("Reached maximum limit of 100 READMEs. Stopping recursive scan.")
-                break
-            
-            if file.name in readmes: # Avoid re-reading root files already processed
-                continue
-            
-            try:
-                with open(file, encoding="utf-8") as f:
-                    content = f.read()
-                if len(content) > 1024:  # noqa: PLR2004
-                    logger.warning(f"README '{file.name}' is too large (>1KB), truncating.")
-                    readmes[file.name] = content[:1024]
-                else:
-                    readmes[file.name] = content
-            except Exception as e:
-                logger.error(f"Could not read subdirectory README '{file.name}': {e}")
-        
+        # Reads overlap in worker threads, a batch at a time, so the scan still stops once enough READMEs are read
+        with ThreadPoolExecutor(max_workers=README_READ_WORKERS) as executor:
+            # Start with root readmes
+            # Using Path.cwd() to be explicit about the starting point.
+            self._read_readmes_into(readmes, Path.cwd().glob("*.md"), executor, "root")
+
+            # Then scan subdirectories for other Markdown files
+            self._read_readmes_into(readmes, Path.cwd().glob("**/*.md"), executor, "recursive")
 
         return readmes
+
+    def _read_readmes_into(self, readmes: dict[str, str], files: Iterator[Path], executor: ThreadPoolExecutor, scan: str) -> None:
+        """
+        Reads Markdown files for `read_readmes` into `readmes`, in batches no larger than the READMEs still wanted.
+
+        Files named like a README already read are skipped, and the scan stops at the limit of 100 READMEs.
+        """
+        while True:
+            if len(readmes) >= 100:  # noqa: PLR2004
+                logger.info(f"Reached maximum limit of 100 READMEs. Stopping {scan} scan.")
+                return
+
+            batch: dict[str, Path] = {}
+            for file in files:
+                if file.name in readmes or file.name in batch:  # Avoid re-reading root files already processed
+                    continue
+
+                batch[file.name] = file
+                if len(readmes) + len(batch) >= 100:  # noqa: PLR2004
+                    break
+
+            if not batch:
+                return
+
+            contents = executor.map(self._read_readme, batch.values())
+            readmes.update({name: content for name, content in zip(batch, contents, strict=True) if content is not None})
+
+    def _read_readme(self, file: Path) -> str | None:
+        """Reads a single README for `read_readmes`, truncated to 1024 characters, or None if it cannot be read."""
+        try:
+            with open(file, encoding="utf-8") as f:
+                content = f.read()
+        except Exception as e:
+            logger.error(f"Could not read README '{file}': {e}")
+            return None
+
+        if len(content) > 1024:  # noqa: PLR2004
+            logger.warning(f"README '{file.name}' is too large (>1KB), truncating.")
+            return content[:1024]
+
+        return content
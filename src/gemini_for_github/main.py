@@ -31,6 +31,24 @@ from gemini_for_github.shared.logging import BASE_LOGGER
 
 logger = BASE_LOGGER.getChild("main")
 
+READ_ONLY_TOOLS = frozenset(
+    {
+        "get_pull_request_diff",
+        "get_pull_request",
+        "get_issue_with_comments",
+        "get_issue_body",
+        "multi_search_issues",
+        "get_web_page",
+        "read_readmes",
+        "file_read",
+        "folder_contents",
+        "folder_read_all",
+        "search_repo_map",
+        "get_code_structure",
+    }
+)
+"""Tools that only read state; their responses may be reused for repeated calls with the same arguments."""
+
 
 async def _load_config(config_file_path: str, tool_restrictions: str | None, command_restrictions: str | None) -> tuple[Config, ConfigFile]:
     """Loads and parses the application configuration."""
@@ -66,9 +84,9 @@ async def _initialize_filesystem_client(root_path: Path) -> tuple[FileOperations
     return file_operations, folder_operations
 
 
-async def _initialize_genai_client(gemini_api_key: str, model: str, thinking: bool) -> GenAIClient:
+async def _initialize_genai_client(gemini_api_key: str, model: str, thinking: bool, context_caching: bool) -> GenAIClient:
     """Initializes and returns the GenAI client."""
-    return GenAIClient(api_key=gemini_api_key, model=model, thinking=thinking)
+    return GenAIClient(api_key=gemini_api_key, model=model, thinking=thinking, context_caching=context_caching)
 
 
 async def _initialize_aider_client(root_path: Path, model: str) -> AiderClient:
@@ -209,6 +227,9 @@ def prepare_repository(git_client: GitClient, github_client: GitHubAPIClient, pr
 @asyncclick.option("--github-pr-number", type=int, envvar="GITHUB_PR_NUMBER", default=None, help="GitHub pull request number")
 @asyncclick.option("--model", type=str, default="gemini-2.5-flash-preview-04-17", envvar="GEMINI_MODEL", help="Gemini model to use")
 @asyncclick.option("--thinking", type=bool, default=True, envvar="THINKING", help="Enable thinking mode")
+@asyncclick.option(
+    "--context-caching", type=bool, default=False, envvar="CONTEXT_CACHING", help="Cache the system prompt and tools between model requests"
+)
 @asyncclick.option("--config-file", type=str, default=None, envvar="CONFIG_FILE", help="Path to the config file")
 @asyncclick.option(
     "--tool-restrictions", type=str, default=None, envvar="TOOL_RESTRICTIONS", help="Comma-separated list of tool restrictions"
@@ -224,6 +245,7 @@ async def cli(
     github_repo_id: int,
     gemini_api_key: str,
     thinking: bool,
+    context_caching: bool,
     github_issue_number: int | None,
     github_pr_number: int | None,
     model: str,
@@ -255,7 +277,7 @@ async def cli(
         repo_dir = root_path / "repo"
         git_client = await _initialize_git_client(repo_dir, github_token, github_repo)
         web_client = WebClient()
-        genai_client = await _initialize_genai_client(gemini_api_key, model, thinking)
+        genai_client = await _initialize_genai_client(gemini_api_key, model, thinking, context_caching)
 
         project_client = ProjectClient()
 
@@ -263,17 +285,9 @@ async def cli(
 
 
         # Register tools with GenAI client
-        for name, func in github_client.get_tools().items():
-            genai_client.register_tool(name, func)
-        for name, func in git_client.get_tools().items():
-            genai_client.register_tool(name, func)
-
-        for name, func in web_client.get_tools().items():
-            genai_client.register_tool(name, func)
-        for name, func in project_client.get_tools().items():
-            genai_client.register_tool(name, func)
-        # for name, func in bulk_tool_caller.get_tools().items():
-        #     genai_client.register_tool(name, func)
+        for client in (github_client, git_client, web_client, project_client):
+            genai_client.register_tools(client.get_tools(), cacheable_tools=READ_ONLY_TOOLS)
+        # genai_client.register_tools(bulk_tool_caller.get_tools(), cacheable_tools=READ_ONLY_TOOLS)
 
         command = await _select_command(user_question, config.commands, github_issue_number, github_pr_number, genai_client, github_client)
 
@@ -282,12 +296,8 @@ async def cli(
         file_operations, folder_operations = await _initialize_filesystem_client(root_path)
         aider_client = await _initialize_aider_client(repo_dir, model)
 
-        for name, func in file_operations.get_tools().items():
-            genai_client.register_tool(name, func)
-        for name, func in folder_operations.get_tools().items():
-            genai_client.register_tool(name, func)
-        for name, func in aider_client.get_tools().items():
-            genai_client.register_tool(name, func)
+        for client in (file_operations, folder_operations, aider_client):
+            genai_client.register_tools(client.get_tools(), cacheable_tools=READ_ONLY_TOOLS)
 
         context = {}
         if github_issue_number:
@@ -305,9 +315,10 @@ async def cli(
                     "Before I get started with the user's request, I'm going to get some background information."
                 )
             )
-            for tool in command.prerun_tools:
+            # Prerun tools are independent of each other, so fetch them concurrently
+            prerun_results = await asyncio.gather(*(genai_client._handle_function_call(tool, {}) for tool in command.prerun_tools))
+            for tool, result in zip(command.prerun_tools, prerun_results, strict=True):
                 content_list.append(genai_client.new_model_function_call(FunctionCall(name=tool, args={})))
-                result = await genai_client._handle_function_call(tool, {})
                 content_list.append(genai_client.new_model_function_response(FunctionResponse(name=tool, response=result.response)))
             content_list.append(
                 genai_client.new_model_content("I've got the background information I need. Let's get started on the user's request.")
@@ -1,3 +1,4 @@
+import asyncio
 from pathlib import Path
 
 from gemini_for_github.clients.aider import AiderClient
@@ -17,7 +18,7 @@ def test_aider_client_run():
     aider = AiderClient(root=Path(), model=model)
     assert aider is not None
 
-    repo_map = aider.write_code(prompt="/diff")
+    repo_map = asyncio.run(aider.write_code(prompt="/diff"))
 
     assert repo_map is not None
 
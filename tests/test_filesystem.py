@@ -0,0 +1,116 @@
+import asyncio
+
+import pytest
+
+from gemini_for_github.clients.filesystem import FileOperations, FolderOperations
+
+
+@pytest.fixture
+def folder(tmp_path):
+    """Fixture to provide a small project tree."""
+    (tmp_path / "src" / "pkg").mkdir(parents=True)
+    (tmp_path / "src" / "pkg" / "module.py").write_text("import os\n\nprint('Hello')\n")
+    (tmp_path / "src" / "pkg" / "other.py").write_text("def assist():\n    pass\n")
+    (tmp_path / "src" / "bad_encoding.txt").write_bytes(b"\xff\xfe")
+    (tmp_path / "notes.txt").write_text("one\ntwo\nthree\n")
+    return tmp_path
+
+
+@pytest.fixture
+def folder_operations(folder):
+    """Fixture to provide a FolderOperations instance rooted at the project tree."""
+    return FolderOperations(root_dir=folder)
+
+
+def test_read_all(folder, folder_operations):
+    """Tests that read_all returns every readable file in listing order and reports unreadable ones."""
+    files = asyncio.run(folder_operations.contents(str(folder), [], [], recurse=True))
+
+    summary = asyncio.run(folder_operations.read_all(str(folder), include=[], exclude=[], recurse=True))
+
+    assert summary.total_files == len(files)
+    assert [result.file_path for result in summary.results] == [file for file in files if not file.endswith("bad_encoding.txt")]
+    assert [error.file_path for error in summary.errors] == ["src/bad_encoding.txt"]
+
+    contents = {result.file_path: result.content for result in summary.results}
+    assert contents["src/pkg/other.py"] == "def assist():\n    pass\n"
+
+
+def test_read_all_head(folder, folder_operations):
+    """Tests that read_all only returns the first `head` lines of each file."""
+    summary = asyncio.run(folder_operations.read_all(str(folder), include=["*.txt"], exclude=[], recurse=True, head=2))
+
+    contents = {result.file_path: result.content for result in summary.results}
+    assert next(content for file, content in contents.items() if file.endswith("notes.txt")) == "one\ntwo\n"
+
+
+def test_read_all_tail(folder, folder_operations):
+    """Tests that read_all returns the last `tail` lines, not bytes, of each file."""
+    summary = asyncio.run(folder_operations.read_all(str(folder), include=["*.txt"], exclude=[], recurse=True, tail=2))
+
+    contents = {result.file_path: result.content for result in summary.results}
+    assert next(content for file, content in contents.items() if file.endswith("notes.txt")) == "two\nthree\n"
+
+
+def test_read_all_default_exclusions(folder, folder_operations):
+    """Tests that read_all skips files matching the default read exclusions, by extension or by glob."""
+    (folder / "src" / "pkg" / "module.pyc").write_bytes(b"\x00")
+    (folder / "src" / "pkg" / "._module.py").write_text("resource fork\n")
+    (folder / "notes.txt~").write_text("backup\n")
+
+    summary = asyncio.run(folder_operations.read_all(str(folder), include=[], exclude=[], recurse=True))
+
+    read_files = [result.file_path for result in summary.results] + [error.file_path for error in summary.errors]
+    assert not [file for file in read_files if file.endswith((".pyc", "~")) or "/._" in file]
+
+
+def test_iter_read_all(folder, folder_operations):
+    """Tests that iter_read_all yields the same outcomes as read_all, and can be stopped early."""
+    for index in range(100):
+        (folder / "src" / f"generated_{index}.txt").write_text(f"{index}\n")
+
+    summary = asyncio.run(folder_operations.read_all(str(folder), include=[], exclude=[], recurse=True))
+
+    async def collect(limit: int | None = None):
+        outcomes = []
+        async for outcome in folder_operations.iter_read_all(str(folder), include=[], exclude=[], recurse=True):
+            outcomes.append(outcome)
+            if len(outcomes) == limit:
+                break
+        return outcomes
+
+    outcomes = asyncio.run(collect())
+    assert sorted(outcome.file_path for outcome in outcomes) == sorted(
+        [result.file_path for result in summary.results] + [error.file_path for error in summary.errors]
+    )
+
+    limit = 3
+    assert len(asyncio.run(collect(limit=limit))) == limit
+
+
+def test_contents_not_recursive(folder, folder_operations):
+    """Tests that a non-recursive listing applies the default exclusions and the include and exclude patterns."""
+    (folder / ".git").mkdir()
+    (folder / ".env").write_text("SECRET=1\n")
+    (folder / "__pycache__").mkdir()
+    (folder / "setup.py").write_text("")
+
+    assert sorted(asyncio.run(folder_operations.contents(str(folder), [], [], recurse=False))) == ["notes.txt", "setup.py", "src"]
+    assert asyncio.run(folder_operations.contents(str(folder), ["*.py"], [], recurse=False)) == ["setup.py"]
+    assert sorted(asyncio.run(folder_operations.contents(str(folder), [], ["*.py"], recurse=False))) == ["notes.txt", "src"]
+    assert ".env" in asyncio.run(folder_operations.contents(str(folder), [], [], recurse=False, bypass_default_exclusions=True))
+
+
+def test_read_sees_changes(folder):
+    """Tests that FileOperations.read returns the current content of a file it has read before."""
+    file_operations = FileOperations(root_dir=folder)
+    notes = str(folder / "notes.txt")
+
+    assert asyncio.run(file_operations.read(notes)) == "one\ntwo\nthree\n"
+    assert asyncio.run(file_operations.read(notes)) == "one\ntwo\nthree\n"
+
+    asyncio.run(file_operations.append(notes, "four\n"))
+    assert asyncio.run(file_operations.read(notes)) == "one\ntwo\nthree\nfour\n"
+
+    (folder / "notes.txt").write_text("five\n")
+    assert asyncio.run(file_operations.read(notes)) == "five\n"
@@ -0,0 +1,91 @@
+import asyncio
+
+import pytest
+from google.genai.types import CachedContent, Candidate, Content, FunctionCall, GenerateContentResponse, Part
+
+from gemini_for_github.clients.gemini import GenAIClient
+
+
+def _function_call_response(*function_calls: tuple[str, dict]) -> GenerateContentResponse:
+    """Builds a model response making the given (name, args) function calls in a single turn."""
+    parts = [Part(function_call=FunctionCall(name=name, args=args)) for name, args in function_calls]
+    return GenerateContentResponse(candidates=[Candidate(content=Content(role="model", parts=parts))])
+
+
+@pytest.fixture
+def genai_client():
+    """Fixture to provide a GenAIClient instance that never contacts the API."""
+    return GenAIClient(api_key="test-api-key")
+
+
+def test_perform_task_runs_calls_made_alongside_report_completion(genai_client, mocker):
+    """Tests that side-effecting calls in the same turn as report_completion still run, in order."""
+    calls = []
+
+    def create_issue_comment(body: str) -> str:
+        """Comments on the issue."""
+        calls.append(("create_issue_comment", body))
+        return "commented"
+
+    def write_code(prompt: str) -> str:
+        """Writes code."""
+        calls.append(("write_code", prompt))
+        return "written"
+
+    genai_client.register_tools({"create_issue_comment": create_issue_comment, "write_code": write_code})
+
+    response = _function_call_response(
+        ("create_issue_comment", {"body": "On it"}),
+        ("write_code", {"prompt": "Fix the bug"}),
+        ("report_completion", {"task_details": "Fix the bug", "completion_details": "Fixed"}),
+    )
+    mocker.patch.object(genai_client, "_get_completion", mocker.AsyncMock(return_value=response))
+
+    result = asyncio.run(
+        genai_client.perform_task("system", [GenAIClient.new_user_content("Fix the bug")], ["create_issue_comment", "write_code"])
+    )
+
+    assert result.success
+    assert result.completion_details == "Fixed"
+    assert calls == [("create_issue_comment", "On it"), ("write_code", "Fix the bug")]
+
+
+def test_perform_task_runs_calls_made_alongside_report_failure(genai_client, mocker):
+    """Tests that calls in the same turn as report_failure still run before the failure is returned."""
+    calls = []
+
+    def create_issue_comment(body: str) -> str:
+        """Comments on the issue."""
+        calls.append(body)
+        return "commented"
+
+    genai_client.register_tools({"create_issue_comment": create_issue_comment})
+
+    response = _function_call_response(
+        ("report_failure", {"task_details": "Fix the bug", "failure_details": "Could not reproduce"}),
+        ("create_issue_comment", {"body": "Could not reproduce"}),
+    )
+    mocker.patch.object(genai_client, "_get_completion", mocker.AsyncMock(return_value=response))
+
+    result = asyncio.run(genai_client.perform_task("system", [GenAIClient.new_user_content("Fix the bug")], ["create_issue_comment"]))
+
+    assert not result.success
+    assert calls == ["Could not reproduce"]
+
+
+def test_perform_task_deletes_context_cache(mocker):
+    """Tests that a context cache created for a task is deleted once the task ends."""
+    genai_client = GenAIClient(api_key="test-api-key", context_caching=True)
+
+    client = mocker.patch.object(genai_client, "client")
+    client.caches.create = mocker.AsyncMock(return_value=CachedContent(name="cachedContents/test"))
+    client.caches.delete = mocker.AsyncMock()
+
+    response = _function_call_response(("report_completion", {"task_details": "Answer", "completion_details": "Answered"}))
+    get_completion = mocker.patch.object(genai_client, "_get_completion", mocker.AsyncMock(return_value=response))
+
+    result = asyncio.run(genai_client.perform_task("system", [GenAIClient.new_user_content("Answer")], []))
+
+    assert result.success
+    assert get_completion.call_args.kwargs["cached_content"] == "cachedContents/test"
+    client.caches.delete.assert_awaited_once_with(name="cachedContents/test")